@@ -0,0 +1,60 @@
+"""Image assets shared by every window.
+
+Each file is decoded once per process, and the sizes the UI draws at are
+scaled once and kept in a byte-bounded LRU, so navigating between screens
+does not go back to disk.
+"""
+import os, sys
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QPixmap
+
+LOGO_SIZE = QSize(250, 250)
+HEADER_LOGO_SIZE = QSize(100, 100)
+CACHE_LIMIT_BYTES = 64 * 1024 * 1024
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller."""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.abspath(os.path.dirname(__file__))
+    return os.path.join(base_path, relative_path)
+
+_cache = OrderedDict()  # (path, width, height) -> QPixmap, least recently used first
+_cache_bytes = 0
+
+def _cost(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+def _remember(key, pixmap):
+    global _cache_bytes
+    _cache[key] = pixmap
+    _cache_bytes += _cost(pixmap)
+    while _cache_bytes > CACHE_LIMIT_BYTES and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= _cost(evicted)
+
+def pixmap(name, size=None):
+    """Cached QPixmap for a bundled file name (or absolute path), optionally stretched to size."""
+    path = name if os.path.isabs(name) else resource_path(name)
+    key = (path, size.width(), size.height()) if size is not None else (path, 0, 0)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+    if size is None:
+        result = QPixmap(path)
+    else:
+        source = pixmap(path)
+        if source.isNull() or source.size() == size:
+            result = source
+        else:
+            result = source.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    _remember(key, result)
+    return result
+
+def clear():
+    global _cache_bytes
+    _cache.clear()
+    _cache_bytes = 0
@@ -0,0 +1,59 @@
+"""Save latency while the database is down, with and without the circuit breaker.
+
+    python benchmarks/bench_breaker.py --saves 10
+
+Stands up a server that accepts TCP connections and never answers, the way
+a hung or overloaded MySQL looks from a kiosk, points IIS_DB_HOST/PORT at
+it and borrows a connection as submission.save_record does, with the
+timeouts as configured (IIS_DB_CONNECT_TIMEOUT etc., 3 s by default).
+Without the breaker every save waits out the handshake timeout and its
+retry; with it the first few do and the rest fail in microseconds and go
+straight to the offline journal.
+"""
+import os, sys, time, socket, argparse, threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_connector
+
+def silent_server():
+    """Port of a listener that accepts and then says nothing."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(64)
+    held = []
+
+    def accept():
+        while True:
+            held.append(listener.accept()[0])
+
+    threading.Thread(target=accept, daemon=True).start()
+    return listener.getsockname()[1]
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def run(saves, failure_threshold):
+    db_connector.breaker = db_connector.CircuitBreaker(failure_threshold=failure_threshold, probe_interval=600)
+    latencies = []
+    for _ in range(saves):
+        start = time.perf_counter()
+        with db_connector.pooled_connection(user_role="student") as conn:
+            assert conn is None
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--saves", type=int, default=10)
+    args = parser.parse_args()
+
+    db_connector.DB_HOST, db_connector.DB_PORT = "127.0.0.1", silent_server()
+    print(f"connect timeout {db_connector.CONNECT_TIMEOUT}s, read timeout {db_connector.READ_TIMEOUT}s, "
+          f"{db_connector.CONNECT_ATTEMPTS} attempts")
+    for label, threshold in (("no breaker", 10 ** 9), ("breaker", 3)):
+        latencies = run(args.saves, threshold)
+        print(f"{label:>10}: total {sum(latencies):6.2f}s  p50 {percentile(latencies, 0.5) * 1000:8.2f} ms  "
+              f"max {max(latencies) * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Peak RSS and rows/sec of the streaming exporter on a synthetic table.
+
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_export.py populate 200000
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_export.py run out.xlsx
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_export.py run out.csv
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_export.py cleanup
+
+Run each export in its own process so ru_maxrss reflects that export alone.
+"""
+import os, sys, time, resource
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_connector import pooled_connection
+from registration import insert_records
+from enrollment_stats import subtract_counts
+import exporter
+
+PREFIX = "SYN-"
+COURSES = ("Bachelor of Science in Information Technology", "Bachelor of Science in Criminology",
+           "Associate in Computer Technology", "Bachelor of Elementary Education")
+YEARS = ("1st Year", "2nd Year", "3rd Year", "4th Year")
+
+def populate(total, chunk=2000):
+    with pooled_connection(user_role="admin") as conn:
+        for base in range(0, total, chunk):
+            insert_records(conn, "student", [
+                (f"{PREFIX}{i:07d}", f"SURNAME{i % 5000}", f"First{i % 700}", "A.", "",
+                 "San Isidro, Santa Ana, Pampanga", YEARS[i % 4], COURSES[i % 4],
+                 f"Guardian {i}", "Parent", "0917%07d" % (i % 10000000))
+                for i in range(base, min(base + chunk, total))
+            ])
+    print(f"inserted {total} synthetic students")
+
+def run(path):
+    start = time.perf_counter()
+    count = exporter.export("student", path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{count} rows -> {path}: {elapsed:.2f}s, {count / elapsed:.0f} rows/sec, peak RSS {peak_mb:.1f} MB")
+
+def cleanup():
+    with pooled_connection(user_role="admin") as conn:
+        cursor = conn.cursor()
+        # insert_records counted them; take them off registration_counts in the same transaction
+        subtract_counts(cursor, "student", "student_id LIKE %s", (PREFIX + "%",))
+        cursor.execute("DELETE FROM students WHERE student_id LIKE %s", (PREFIX + "%",))
+        conn.commit()
+        print(f"removed {cursor.rowcount} synthetic students")
+        cursor.close()
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command == "populate":
+        populate(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+    elif command == "cleanup":
+        cleanup()
+    else:
+        run(sys.argv[2] if len(sys.argv) > 2 else "export_bench.xlsx")
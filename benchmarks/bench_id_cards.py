@@ -0,0 +1,43 @@
+"""ID-card rendering throughput against the number of worker processes.
+
+    python benchmarks/bench_id_cards.py [cards] [max_workers]
+
+Renders the same synthetic students with 0 (in-process), 1, 2, ... workers
+into a PDF and into a folder of PNGs, and reports cards/sec for each;
+worker start-up is included.
+"""
+import os, sys, time, shutil, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import multiprocessing
+from id_cards import render_cards, write_pdf, write_pngs
+
+CARDS = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+MAX_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+
+def rows(n):
+    for i in range(n):
+        yield {"student_id": f"2025-{i:05d}", "surname": "DELA CRUZ", "first_name": "Juan Carlo",
+               "mi": "P.", "extension": "", "course": "Associate in Computer Technology",
+               "year": "1st Year", "emergency_name": "Maria Dela Cruz", "emergency_relation": "Mother",
+               "emergency_contact": "09171234567"}
+
+def main():
+    print(f"{CARDS} cards, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'PDF s':>8}{'cards/s':>9}{'PNG s':>8}{'cards/s':>9}")
+    counts = [0] + [w for w in (1, 2, 4, 8, 16) if w <= MAX_WORKERS]
+    for workers in counts:
+        path = os.path.join(tempfile.gettempdir(), f"bench_cards_{workers}")
+        start = time.perf_counter()
+        write_pdf(path + ".pdf", render_cards("student", rows(CARDS), workers, as_png=False))
+        pdf = time.perf_counter() - start
+        start = time.perf_counter()
+        write_pngs(path, render_cards("student", rows(CARDS), workers), "student_id")
+        png = time.perf_counter() - start
+        print(f"{workers:>8}{pdf:>8.2f}{CARDS / pdf:>9.1f}{png:>8.2f}{CARDS / png:>9.1f}")
+        os.remove(path + ".pdf")
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,179 @@
+"""Load generator: many kiosks submitting straight to MySQL vs through the ingestion daemon.
+
+    python benchmarks/bench_ingest.py --kiosks 24 --records 200 --commit-ms 2 --rtt-ms 0.5
+
+Runs against a stand-in database by default: every round trip costs rtt_ms,
+every commit holds a shared log-flush lock for commit_ms (one redo log, as
+on the real server), and duplicate IDs fail like the UNIQUE keys. About 1%
+of the submissions reuse an ID so the duplicate path is exercised too. Each
+kiosk is a thread submitting back to back; reported are records/s, commits
+and p50/p95/p99 submit latency per mode.
+"""
+import os, sys, time, asyncio, argparse, threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pymysql
+from registration import insert_records, DuplicateRecordError
+from ingest_server import IngestServer, DUPLICATE
+import submission
+
+class StandInDatabase:
+    def __init__(self, rtt, commit):
+        self.rtt = rtt
+        self.commit_time = commit
+        self.flush_lock = threading.Lock()
+        self.ids = set()
+        self.lock = threading.Lock()
+        self.commits = 0
+
+class StandInCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def executemany(self, query, rows):
+        db = self.conn.db
+        time.sleep(db.rtt)
+        with db.lock:
+            for row in rows:
+                if row[0] in db.ids or row[0] in self.conn.pending:
+                    raise pymysql.err.IntegrityError(1062, f"Duplicate entry '{row[0]}' for key 'PRIMARY'")
+            self.conn.pending.update(row[0] for row in rows)
+
+    def execute(self, query, args=None):
+        db = self.conn.db
+        time.sleep(db.rtt)
+        if query.startswith("SELECT"):
+            with db.lock:
+                self.rows = [{"student_id": value} for value in args if value in db.ids]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+class StandInConnection:
+    def __init__(self, db):
+        self.db = db
+        self.pending = set()
+
+    def cursor(self, *args):
+        return StandInCursor(self)
+
+    def ping(self, reconnect=True):
+        time.sleep(self.db.rtt)
+
+    def commit(self):
+        time.sleep(self.db.rtt)
+        with self.db.flush_lock:
+            time.sleep(self.db.commit_time)
+            with self.db.lock:
+                self.db.ids.update(self.pending)
+                self.db.commits += 1
+        self.pending = set()
+
+    def rollback(self):
+        self.pending = set()
+
+class StandInPool:
+    """acquire/release like db_connector.ConnectionPool, one connection per thread."""
+    def __init__(self, db):
+        self.db = db
+        self.local = threading.local()
+
+    def acquire(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = StandInConnection(self.db)
+        conn.ping()
+        return conn
+
+    def release(self, conn, discard=False):
+        conn.rollback()
+
+def workload(kiosk, records):
+    # Columns in TABLES["student"] order; every hundredth ID repeats one from another kiosk
+    for n in range(records):
+        record_id = f"K{(kiosk + 1) % 1000}-{n - 1}" if n % 100 == 99 else f"K{kiosk}-{n}"
+        yield (record_id, "DELA CRUZ", "Juan", "P.", "", "San Isidro, Santa Ana, Pampanga",
+               "1st Year", "Associate in Computer Technology", "Maria Dela Cruz", "Mother", "09171234567")
+
+def run_kiosks(kiosks, records, submit):
+    latencies = []
+    outcomes = {}
+    lock = threading.Lock()
+
+    def kiosk(k):
+        mine = []
+        for values in workload(k, records):
+            start = time.perf_counter()
+            outcome = submit(values)
+            mine.append(time.perf_counter() - start)
+            with lock:
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=kiosk, args=(k,)) for k in range(kiosks)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), outcomes
+
+def direct(db):
+    pool = StandInPool(db)
+    def submit(values):
+        conn = pool.acquire()
+        try:
+            insert_records(conn, "student", [values])
+            return "saved"
+        except DuplicateRecordError:
+            return DUPLICATE
+        finally:
+            pool.release(conn)
+    return submit
+
+def start_daemon(db, connections, window):
+    server = IngestServer(connections, window, pool=StandInPool(db))
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    address = []
+
+    async def serve():
+        listener = await server.start("127.0.0.1", 0)
+        address.append(listener.sockets[0].getsockname()[:2])
+        started.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True).start()
+    started.wait()
+    return lambda values: submission.send_to_daemon("student", values, address=address[0])
+
+def report(name, db, elapsed, latencies, outcomes):
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+    print(f"{name:<8}{len(latencies) / elapsed:>10.0f}{db.commits:>9}{pct(50):>9.1f}{pct(95):>9.1f}"
+          f"{pct(99):>9.1f}  {dict(sorted(outcomes.items()))}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kiosks", type=int, default=24)
+    parser.add_argument("--records", type=int, default=200, help="submissions per kiosk")
+    parser.add_argument("--commit-ms", type=float, default=2.0)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.kiosks} kiosks x {args.records} records, commit {args.commit_ms}ms, rtt {args.rtt_ms}ms")
+    print(f"{'mode':<8}{'rec/s':>10}{'commits':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  outcomes")
+    db = StandInDatabase(args.rtt_ms / 1000, args.commit_ms / 1000)
+    report("direct", db, *run_kiosks(args.kiosks, args.records, direct(db)))
+    db = StandInDatabase(args.rtt_ms / 1000, args.commit_ms / 1000)
+    submit = start_daemon(db, args.connections, args.window_ms / 1000)
+    report("daemon", db, *run_kiosks(args.kiosks, args.records, submit))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Round trips and latency of the old SELECT-then-INSERT path vs insert_records.
+
+Each simulated kiosk is a thread borrowing a pooled connection for every
+submit, as submission.save_record does, so the checkout ping, the commit,
+the rollback on release (skipped after a clean commit) and the counts
+upsert are all counted: a round trip is every operation db_timing sees
+except connect and the pool wait. Rows are tagged with a per-run prefix
+and removed afterwards with the admin role:
+
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_insert_path.py [kiosks] [submits]
+"""
+import os, sys, time, uuid, threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_timing
+from db_connector import pooled_connection, get_pool
+from registration import insert_sql, insert_records
+from enrollment_stats import subtract_counts
+
+NOT_ROUND_TRIPS = ("connect", "pool_wait")
+
+def record(student_id):
+    return (student_id, "BENCH", "Kiosk", "K.", "", "Brgy, Town, Province",
+            "1st Year", "Associate in Computer Technology", "Guardian", "Parent", "09170000000")
+
+def submit_old(conn, student_id):
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM students WHERE student_id = %s", (student_id,))
+    if not cursor.fetchone():
+        cursor.execute(insert_sql("student"), record(student_id))
+        conn.commit()
+    cursor.close()
+
+def submit_new(conn, student_id):
+    insert_records(conn, "student", [record(student_id)])
+
+def run(label, submit, kiosks, submits, prefix):
+    db_timing.reset()
+    latencies = []
+    def kiosk(k):
+        for i in range(submits):
+            start = time.perf_counter()
+            with pooled_connection(user_role="student") as conn:
+                submit(conn, f"{prefix}-{label}-{k}-{i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+    threads = [threading.Thread(target=kiosk, args=(k,)) for k in range(kiosks)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    n = len(latencies)
+    operations = {op: count for op, count in db_timing.counts().items() if op not in NOT_ROUND_TRIPS}
+    print(f"{label}: {n} submits, {sum(operations.values()) / n:.2f} round trips each, "
+          f"p50={latencies[n // 2]:.2f}ms p99={latencies[int(n * 0.99)]:.2f}ms, {n / elapsed:.0f}/s")
+    print("    per submit: " + ", ".join(f"{op} {count / n:.2f}" for op, count in sorted(operations.items())))
+
+if __name__ == "__main__":
+    kiosks = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    submits = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    get_pool("student").max_size = kiosks
+    prefix = "B" + uuid.uuid4().hex[:8]
+    try:
+        run("select+insert", submit_old, kiosks, submits, prefix)
+        run("single-insert", submit_new, kiosks, submits, prefix)
+    finally:
+        with pooled_connection(user_role="admin") as conn:
+            cursor = conn.cursor()
+            # Only the single-insert run went through insert_records and its counts upsert
+            subtract_counts(cursor, "student", "student_id LIKE %s", (f"{prefix}-single-insert-%",))
+            cursor.execute("DELETE FROM students WHERE student_id LIKE %s", (prefix + "-%",))
+            conn.commit()
+            cursor.close()
@@ -0,0 +1,61 @@
+"""Switch time and memory over repeated Landing -> Student/Employee -> Back navigation.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_navigation.py [navigations] [cold navigations]
+
+Prints the mean/max switch time and current RSS for every block of 100
+navigations; with the persistent MainWindow both should stay flat. A
+second, fresh window is then navigated with the asset cache cleared (and
+the landing background dropped) before every hop, which is what each
+screen used to pay by loading its images from disk; set against the first
+run it shows what the asset cache saves.
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+import assets
+import first_page
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+def navigate(app, navigations, cold=False):
+    window = first_page.MainWindow(warm_up=False)
+    app.processEvents()
+    steps = [window.landing.stud_registration, window.show_landing,
+             window.landing.emp_registration, window.show_landing]
+    samples = []
+    block = []
+    for i in range(navigations):
+        if cold:
+            assets.clear()
+            window.landing._background = None
+        start = time.perf_counter()
+        steps[i % len(steps)]()
+        app.processEvents()
+        block.append(time.perf_counter() - start)
+        if len(block) == 100 and not cold:
+            print(f"navigations {i - 98:5d}-{i + 1:5d}: mean={sum(block) / 100 * 1000:6.2f}ms "
+                  f"max={max(block) * 1000:6.2f}ms rss={rss_mb():7.1f} MB "
+                  f"widgets={len(QApplication.allWidgets())}")
+            samples.extend(block)
+            block = []
+    samples.extend(block)
+    window.close()
+    return sorted(samples)
+
+def report(label, samples):
+    n = len(samples)
+    print(f"{label:<6} {n} hops: mean={sum(samples) / n * 1000:.2f}ms p95={samples[int(n * 0.95)] * 1000:.2f}ms")
+
+def main(navigations, cold_navigations):
+    app = QApplication(sys.argv)
+    warm = navigate(app, navigations)
+    cold = navigate(app, cold_navigations, cold=True)
+    report("cached", warm)
+    report("cold", cold)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
@@ -0,0 +1,44 @@
+"""Offscreen repaint rate of the landing page and its StrokeLabel title.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_paint.py [frames]
+
+Each run forces synchronous repaints of a 1920x1080 landing page. The
+"uncached" figures drop the render caches before every frame, and for the
+page the asset cache too (so arial.jpg is decoded and scaled again), which
+is what each paint used to cost.
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+import assets
+import first_page
+
+def fps(widget, frames, drop_cache):
+    start = time.perf_counter()
+    for _ in range(frames):
+        drop_cache()
+        widget.repaint()
+    return frames / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = QApplication(sys.argv)
+    page = first_page.Page()
+    page.showNormal()
+    page.resize(1920, 1080)
+    app.processEvents()
+    title = page.findChild(first_page.StrokeLabel)
+
+    def drop_page():
+        assets.clear()
+        page._background = None
+    def drop_title():
+        title._cache_key = None
+    def keep():
+        pass
+
+    print(f"page   uncached: {fps(page, frames, drop_page):8.1f} fps")
+    print(f"page   cached:   {fps(page, frames, keep):8.1f} fps")
+    print(f"title  uncached: {fps(title, frames, drop_title):8.1f} fps")
+    print(f"title  cached:   {fps(title, frames, keep):8.1f} fps")
@@ -0,0 +1,105 @@
+"""Duplicate-person detection over synthetic students and employees.
+
+    python benchmarks/bench_person_match.py [people] [workers]
+
+About 1% of the people are entered a second time under a new ID, with the
+spelling disturbed the ways it happens at the kiosk: Ñ typed as N, extra
+or missing spaces in the surname, a dropped middle initial, C/K swaps, a
+typo, or the town abbreviated. Reports the time per stage and how many of
+those planted duplicates the report catches.
+"""
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import multiprocessing
+from person_match import person, build_blocks, find_duplicates, _comparisons
+
+PEOPLE = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+SURNAMES = ["Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Peña", "Bautista", "Villanueva", "Castillo",
+            "De Guzman", "Manalo", "Lacson", "Dizon", "Cunanan", "Mercado", "Navarro", "Pangilinan", "Yabut",
+            "Tolentino", "Sicat", "Gomez", "Ocampo", "Torres", "Flores", "Aquino", "Ramos", "Salazar", "Lim",
+            "Nuñez", "Canlas", "David", "Manansala", "Serrano", "Valdez", "Soriano", "Cruz", "Lapid"]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Carlo", "Kristine", "Mark", "Angelica", "John Paul", "Jericho",
+               "Princess", "Christian", "Nicole", "Joshua", "Camille", "Miguel", "Patricia", "Rafael", "Bea",
+               "Kenneth", "Jasmine", "Paolo", "Andrea", "Ramon", "Liza", "Francis", "Rowena", "Niño", "Catherine"]
+TOWNS = ["Santa Ana", "Arayat", "Candaba", "Mexico", "San Luis", "Santa Rita", "Magalang", "Apalit"]
+BARANGAYS = ["San Isidro", "San Juan", "San Pedro", "Santa Lucia", "San Roque", "Santiago", "San Jose"]
+
+SYLLABLES = ["ma", "na", "la", "ca", "ba", "ta", "pa", "sa", "ga", "da", "yu", "qui", "mi", "lo", "ri", "to",
+             "nu", "ñez", "gui", "bay", "lan", "tan", "san", "dig", "pan", "lin", "ngan", "rez", "cion", "des"]
+
+def surname_pool(rng, size=20000):
+    """The common surnames above plus made-up ones, so blocks are as varied as a real roll."""
+    pool = list(SURNAMES)
+    while len(pool) < size:
+        pool.append("".join(rng.choice(SYLLABLES) for _ in range(rng.choice((2, 3, 3, 4)))).title())
+    return pool
+
+def random_person(rng, n, surnames):
+    kind = "student" if n % 5 else "employee"
+    # Skewed: the common surnames at the front turn up far more often than the rest
+    surname = surnames[int(len(surnames) * rng.random() ** 3)]
+    if rng.random() < 0.1:
+        surname = rng.choice(["De ", "Dela ", "Del "]) + surname
+    first = rng.choice(FIRST_NAMES) + (rng.choice(["", " " + rng.choice(FIRST_NAMES)]))
+    return {f"{kind}_id": f"{kind[0].upper()}-{n:07d}", "surname": surname.upper(), "first_name": first,
+            "mi": rng.choice("ABCDEFGLMPRST") + ".",
+            "address": f"{rng.choice(BARANGAYS)}, {rng.choice(TOWNS)}, Pampanga",
+            "emergency_name": f"{rng.choice(FIRST_NAMES)} {surname.title()}",
+            "emergency_contact": "09" + "".join(rng.choice("0123456789") for _ in range(9))}, kind
+
+def disturb(rng, row, n, kind):
+    row = dict(row)
+    row[f"{kind}_id"] = f"DUP-{n:07d}"
+    change = rng.randrange(6)
+    if change == 0:
+        row["surname"] = row["surname"].replace("Ñ", "N")
+        row["first_name"] = row["first_name"].replace("ñ", "n")
+    elif change == 1:
+        row["surname"] = row["surname"].replace(" ", "") if " " in row["surname"] else row["surname"][:2] + " " + row["surname"][2:]
+    elif change == 2:
+        row["mi"] = ""
+    elif change == 3:
+        row["first_name"] = row["first_name"].replace("C", "K").replace("c", "k")
+    elif change == 4:
+        i = rng.randrange(1, len(row["surname"]))
+        row["surname"] = row["surname"][:i] + row["surname"][i - 1] + row["surname"][i + 1:]
+    else:
+        row["address"] = row["address"].replace("Santa", "Sta.")
+    return row
+
+def main():
+    rng = random.Random(7)
+    start = time.perf_counter()
+    people, planted = [], set()
+    surnames = surname_pool(rng)
+    for n in range(PEOPLE):
+        row, kind = random_person(rng, n, surnames)
+        people.append(person(kind, row))
+        if rng.random() < 0.01:
+            # Sometimes the second entry lands in the other table
+            other = kind if rng.random() < 0.8 else ("employee" if kind == "student" else "student")
+            twin = disturb(rng, row, n, kind)
+            twin[f"{other}_id"] = twin.pop(f"{kind}_id")
+            planted.add((len(people) - 1, len(people)))
+            people.append(person(other, twin))
+    print(f"{len(people)} people, {len(planted)} planted duplicates, built in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    blocks = build_blocks(people)
+    comparisons = sum(_comparisons(members) for members in blocks)
+    print(f"{len(blocks)} blocks, largest {max(map(len, blocks))}, {comparisons} comparisons "
+          f"(all pairs: {len(people) * (len(people) - 1) // 2}), blocking {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    matches = find_duplicates(people, workers=WORKERS)
+    elapsed = time.perf_counter() - start
+    found = {(min(a, b), max(a, b)) for _, a, b, _ in matches}
+    caught = len(planted & found)
+    print(f"matching with {WORKERS} workers: {elapsed:.1f}s, {len(matches)} pairs reported, "
+          f"{caught}/{len(planted)} planted caught, {len(found - planted)} other pairs")
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,41 @@
+"""Per-submit latency with and without the connection pool.
+
+Point it at a local MariaDB loaded with dbsetup.txt:
+
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_pool.py [submits]
+"""
+import os, sys, time, statistics
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_connector import connect_to_database, pooled_connection
+
+LOOKUP = "SELECT * FROM students WHERE student_id = %s"
+
+def submit_direct(student_id):
+    conn = connect_to_database(user_role="student")
+    cursor = conn.cursor()
+    cursor.execute(LOOKUP, (student_id,))
+    cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+def submit_pooled(student_id):
+    with pooled_connection(user_role="student") as conn:
+        cursor = conn.cursor()
+        cursor.execute(LOOKUP, (student_id,))
+        cursor.fetchone()
+        cursor.close()
+
+def run(label, fn, n):
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(f"BENCH-{i}")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"{label:<8} n={n}  mean={statistics.mean(samples):.2f}ms  "
+          f"p50={samples[n // 2]:.2f}ms  p95={samples[int(n * 0.95)]:.2f}ms")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    run("direct", submit_direct, n)
+    run("pooled", submit_pooled, n)
@@ -0,0 +1,137 @@
+"""Search latency on a synthetic students table: keyset pages vs OFFSET, with and without indexes.
+
+Creates students_search_bench (LIKE students), fills it with synthetic
+rows, times the first page of each search on the bare table, adds the
+search indexes, then times deep pages by keyset and by OFFSET and runs
+the EXPLAIN check. The table is dropped afterwards unless --keep:
+
+    IIS_DB_HOST=127.0.0.1 python benchmarks/bench_search.py --rows 500000
+"""
+import os, sys, time, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_connector import connect_to_database
+from registration import TABLES
+from schema import COURSES, YEARS
+from search import SEARCH_INDEXES, build_search, search_page, ensure_indexes, existing_indexes
+from check_search_plans import check_plans
+
+TABLE = "students_search_bench"
+BATCH = 5000
+SURNAMES = ["SANTOS", "REYES", "CRUZ", "BAUTISTA", "OCAMPO", "GARCIA", "MENDOZA", "TORRES", "TOMAS",
+            "ANDRADE", "CASTILLO", "FLORES", "VILLANUEVA", "RAMOS", "CASTRO", "RIVERA", "AQUINO",
+            "NAVARRO", "SALAZAR", "MERCADO", "DELA CRUZ", "DEL ROSARIO", "SORIANO", "SANTIAGO",
+            "SARMIENTO", "SALVADOR", "SIBAL", "SUAREZ", "PEÑA", "MAGLALANG", "DAVID", "MANALO",
+            "PANGILINAN", "LACSON", "DIZON", "GUEVARRA", "TUAZON", "YAP", "LIM", "TAN"]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Angel", "John", "Princess", "Carlo", "Nicole",
+               "Paolo", "Kristine", "Miguel", "Andrea", "Rafael", "Camille", "Joshua", "Patricia",
+               "Gabriel", "Niño", "Jasmine", "Adrian", "Bea", "Christian", "Danica"]
+
+def fill(conn, rows):
+    columns = TABLES["student"]["columns"]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(TABLE, ", ".join(columns), ", ".join(["%s"] * len(columns)))
+    random.seed(17)
+    cursor = conn.cursor()
+    try:
+        for start in range(0, rows, BATCH):
+            batch = []
+            for n in range(start, min(start + BATCH, rows)):
+                batch.append((f"BENCH-{n:07d}", random.choice(SURNAMES), random.choice(FIRST_NAMES),
+                              random.choice("ABCDEFGLMPRS") + ".", "", "San Isidro, Santa Ana, Pampanga",
+                              random.choice(YEARS), random.choice(COURSES), "Guardian", "Parent",
+                              "09170000000"))
+            cursor.executemany(sql, batch)
+            conn.commit()
+    finally:
+        cursor.close()
+
+def timed(conn, sql, params, repeat=5):
+    """Median milliseconds over repeat runs."""
+    cursor = conn.cursor()
+    times = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            times.append((time.perf_counter() - start) * 1000)
+    finally:
+        cursor.close()
+    return sorted(times)[len(times) // 2]
+
+def keyset_cursors(conn, arguments, pages, page_size):
+    """Cursor at the start of each wanted page, found by walking the keyset."""
+    wanted = {}
+    after = None
+    for page in range(1, max(pages) + 1):
+        if page in pages:
+            wanted[page] = after
+        _, after = search_page(conn, "student", after=after, limit=page_size, table=TABLE, **arguments)
+        if after is None:
+            break
+    return wanted
+
+def report(conn, label, arguments, pages, page_size):
+    print(f"{label}:")
+    for page, after in keyset_cursors(conn, arguments, pages, page_size).items():
+        sql, params, _ = build_search("student", after=after, limit=page_size, table=TABLE, **arguments)
+        keyset_ms = timed(conn, sql, params)
+        sql, params, _ = build_search("student", limit=page_size, table=TABLE, **arguments)
+        offset_sql = sql.replace("LIMIT %s", "LIMIT %s OFFSET %s")
+        offset_ms = timed(conn, offset_sql, params + [(page - 1) * page_size])
+        print(f"  page {page:5d}: keyset {keyset_ms:7.2f}ms   OFFSET {offset_ms:8.2f}ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="leave the bench table in place")
+    args = parser.parse_args(argv)
+
+    conn = connect_to_database(user_role="admin")
+    if conn is None:
+        return 2
+    name_search = {"surname": "S"}
+    filter_search = {"course": COURSES[7], "year": YEARS[0]}
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(f"CREATE TABLE {TABLE} LIKE {TABLES['student']['table']}")
+        for name in SEARCH_INDEXES["student"]:
+            if name in existing_indexes(conn, TABLE):
+                cursor.execute(f"ALTER TABLE {TABLE} DROP INDEX {name}")
+        cursor.close()
+
+        start = time.perf_counter()
+        fill(conn, args.rows)
+        print(f"{args.rows} rows inserted in {time.perf_counter() - start:.1f}s")
+
+        print("Without search indexes (first page):")
+        for label, arguments in (("surname prefix 'S'", name_search), ("course + year", filter_search)):
+            sql, params, _ = build_search("student", limit=args.page_size, table=TABLE, **arguments)
+            print(f"  {label}: {timed(conn, sql, params, repeat=3):.2f}ms")
+
+        start = time.perf_counter()
+        ensure_indexes(conn, "student", table=TABLE)
+        print(f"Search indexes built in {time.perf_counter() - start:.1f}s")
+        cursor = conn.cursor()
+        cursor.execute(f"ANALYZE TABLE {TABLE}")
+        cursor.fetchall()
+        cursor.close()
+
+        report(conn, "surname prefix 'S'", name_search, (1, 100, 500, 1000), args.page_size)
+        report(conn, "course + year", filter_search, (1, 50, 100), args.page_size)
+
+        failures = check_plans(conn, tables={"student": TABLE}, kinds=("student",))
+        for failure in failures:
+            print("FAIL:", failure)
+        print(f"EXPLAIN check: {'ok' if not failures else f'{len(failures)} regressions'}")
+        return 1 if failures else 0
+    finally:
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Event-loop stall time while a submit runs against a deliberately slow DB.
+
+A QTimer ticks every 10 ms; the longest gap between ticks while the submit is
+in flight is the worst freeze a user would see. Runs headless and exits 1
+if that gap exceeds --max-stall-ms, if the Submit button stays enabled
+while saving, or if the double click is not refused, so it can guard the
+non-blocking submit:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_submit_stall.py [delay_s] [--max-stall-ms 100]
+"""
+import os, sys, time, argparse, tempfile
+from contextlib import contextmanager
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+import iisforms
+import submission
+import offline_queue
+
+DELAY = 2.0
+MAX_STALL_MS = 100
+
+class SlowCursor:
+    def execute(self, query, args=None):
+        time.sleep(DELAY / 2)
+    def executemany(self, query, rows):
+        self.execute(query)
+    def fetchone(self):
+        return None
+    def close(self):
+        pass
+
+class SlowConnection:
+    def cursor(self):
+        return SlowCursor()
+    def commit(self):
+        pass
+    def rollback(self):
+        pass
+
+@contextmanager
+def slow_connection(user_role="student"):
+    yield SlowConnection()
+
+class MessageRecorder:
+    """Stands in for QMessageBox so the modal result box does not block."""
+    shown = []
+    @classmethod
+    def information(cls, parent, title, message):
+        cls.shown.append(title)
+    warning = critical = information
+
+def main(argv=None):
+    global DELAY
+    parser = argparse.ArgumentParser(description="Event-loop stall during a submit against a slow DB.")
+    parser.add_argument("delay", type=float, nargs="?", default=DELAY, help="seconds the stand-in DB takes")
+    parser.add_argument("--max-stall-ms", type=float, default=MAX_STALL_MS)
+    args = parser.parse_args(argv)
+    DELAY = args.delay
+
+    app = QApplication(sys.argv[:1])
+    submission.pooled_connection = slow_connection
+    iisforms.QMessageBox = MessageRecorder
+    journal = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+    journal.close()
+    offline_queue._queue = offline_queue.OfflineQueue(journal.name)
+    form = iisforms.StudentInformationForm()
+    form.surname_edit.setText("DELA CRUZ")
+    form.first_name_edit.setText("Juan")
+    form.mi_edit.setText("P")
+    form.student_id_edit.setText("2025-0001")
+    form.emergency_name_edit.setText("Maria Dela Cruz")
+    form.emergency_relation_edit.setText("Mother")
+    form.emergency_contact_edit.setText("09171234567")
+
+    gaps = []
+    last = [time.perf_counter()]
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+        if "Success" in MessageRecorder.shown:
+            app.quit()
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(10)
+    QTimer.singleShot(int(DELAY * 1000) + 10000, app.quit)  # never hang if the submit is lost
+
+    start = time.perf_counter()
+    form.submit_registration()
+    disabled_while_saving = not form.submit_button.isEnabled()
+    form.submit_registration()  # double click: must be refused while in flight
+    app.exec_()
+    worst = max(gaps) * 1000
+    print(f"submit took {time.perf_counter() - start:.2f}s with a {DELAY:.1f}s DB")
+    print(f"max event-loop stall: {worst:.1f}ms over {len(gaps)} ticks (limit {args.max_stall_ms:.0f}ms)")
+    print(f"result boxes: {MessageRecorder.shown}")
+    os.remove(journal.name)
+
+    failures = []
+    if worst > args.max_stall_ms:
+        failures.append(f"event loop stalled {worst:.1f}ms")
+    if not disabled_while_saving:
+        failures.append("Submit button stayed enabled while saving")
+    if MessageRecorder.shown != ["Please Wait", "Success"]:
+        failures.append(f"expected the double click refused and one success, got {MessageRecorder.shown}")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Scroll a QTableView over a 1M-row RegistrationTableModel and watch memory and stalls.
+
+The page source is synthetic (row n is generated on demand after a short
+sleep standing in for the database), so no server is needed:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_table_model.py [rows] [latency_ms]
+
+The view is scrolled to the end page after page, then jumps back to random
+earlier positions so dropped blocks are fetched again; last, the final
+block is dropped and shown again to check its rows are not added twice.
+A QTimer measures the longest event-loop gap; RSS and blocks held are
+sampled as it goes.
+"""
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication, QTableView, QHeaderView
+from PyQt5.QtCore import QTimer, QThreadPool
+from registrations_view import RegistrationTableModel
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+LATENCY = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+
+def fake_page(after, limit):
+    first = after[0] if after else 0
+    time.sleep(LATENCY)
+    rows = [(n, f"2025-{n:07d}", "DELA CRUZ", "Juan", "P.", "", "San Isidro, Santa Ana, Pampanga",
+             "1st Year", "Associate in Computer Technology", "Maria Dela Cruz", "Mother",
+             "09171234567", "2025-06-01 08:00:00")
+            for n in range(first + 1, min(first + limit, ROWS) + 1)]
+    return rows, ((rows[-1][0],) if rows and rows[-1][0] < ROWS else None)
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+def main():
+    app = QApplication(sys.argv)
+    model = RegistrationTableModel("student", fetch_page=fake_page)
+    view = QTableView()
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(24)
+    view.resize(1100, 700)
+    view.setModel(model)
+    view.show()
+
+    worst_gap = [0.0]
+    last = [time.perf_counter()]
+    def tick():
+        now = time.perf_counter()
+        worst_gap[0] = max(worst_gap[0], now - last[0])
+        last[0] = now
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(5)
+
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    bar = view.verticalScrollBar()
+    model.fetchMore()
+    next_report = 100000
+    while model.canFetchMore() or model._loading:
+        bar.setValue(bar.maximum())
+        app.processEvents()
+        QThreadPool.globalInstance().waitForDone(1)
+        if model.rowCount() >= next_report:
+            print(f"{model.rowCount():8d} rows  blocks held {model.blocks_in_memory:3d}  "
+                  f"rss {rss_mb() - base_rss:+7.1f} MB  {time.perf_counter() - start:6.1f}s")
+            next_report += 100000
+    scroll_seconds = time.perf_counter() - start
+
+    random.seed(3)
+    start = time.perf_counter()
+    for _ in range(200):
+        bar.setValue(random.randrange(bar.maximum() + 1))
+        app.processEvents()
+        while model._loading:
+            QThreadPool.globalInstance().waitForDone(1)
+            app.processEvents()
+        app.processEvents()
+    jump_seconds = time.perf_counter() - start
+
+    # The last block dropped and shown again must not add its rows a second time
+    rows = model.rowCount()
+    last_block = (rows - 1) // model.block_size
+    model._blocks.pop(last_block, None)
+    model.data(model.index(rows - 1, 0))  # what the view does when it repaints the last row
+    while model._loading:
+        QThreadPool.globalInstance().waitForDone(1)
+        app.processEvents()
+    app.processEvents()
+    print(f"last block revisited: {rows} rows before, {model.rowCount()} after"
+          + ("" if model.rowCount() == rows == ROWS else "  MISMATCH"))
+
+    print(f"{model.rowCount()} rows scrolled in {scroll_seconds:.1f}s; 200 random jumps in {jump_seconds:.1f}s")
+    print(f"blocks held {model.blocks_in_memory} of {model.rowCount() // model.block_size + 1}, "
+          f"rss growth {rss_mb() - base_rss:+.1f} MB, worst event-loop gap {worst_gap[0] * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
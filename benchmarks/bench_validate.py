@@ -0,0 +1,71 @@
+"""Per-row normalize/validate loop vs the column-wise pandas engine.
+
+Builds a synthetic student spreadsheet in memory (mixed case, Ñ/ñ typed
+decomposed or as mojibake, mobile numbers missing their leading zero, some
+blanks and repeated IDs) and checks that both paths reject the same rows:
+
+    python benchmarks/bench_validate.py [rows]
+"""
+import os, sys, time, random, unicodedata
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from registration import normalize_fields, validate_fields
+from bulk_validation import normalize_frame, validate_frame
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+NAMES = ["juan carlo", "MARIA  clara", "peña", "dela cruz", "Ñora", "Ã‘oño",
+         unicodedata.normalize("NFD", "niño"), " santos "]
+CONTACTS = ["09171234567", "9171234567", "0917-123-4567", "0917123", ""]
+
+def make_rows(count):
+    random.seed(42)
+    rows = []
+    for n in range(count):
+        rows.append({
+            "student_id": f"2025-{n:06d}" if n % 500 else f"2025-{n - 1:06d}",
+            "surname": random.choice(NAMES), "first_name": random.choice(NAMES),
+            "mi": random.choice(["p", "Q.", "ñ", ""]), "extension": "",
+            "barangay": "San Isidro", "town": "Santa Ana", "province": "Pampanga",
+            "year": "1st Year", "course": "Associate in Computer Technology",
+            "emergency_name": "Maria Dela Cruz", "emergency_relation": "Mother",
+            "emergency_contact": random.choice(CONTACTS),
+        })
+    return rows
+
+def per_row(rows):
+    rejected = 0
+    seen = set()
+    for fields in rows:
+        record = normalize_fields("student", fields)
+        record_id = record["student_id"]
+        if validate_fields("student", record) or record_id in seen:
+            rejected += 1
+        seen.add(record_id)
+    return rejected
+
+def column_wise(frame):
+    errors = validate_frame("student", normalize_frame("student", frame))
+    return int(errors.any(axis=1).sum())
+
+def main():
+    rows = make_rows(ROWS)
+    frame = pd.DataFrame(rows)
+
+    start = time.perf_counter()
+    loop_rejected = per_row(rows)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame_rejected = column_wise(frame)
+    frame_seconds = time.perf_counter() - start
+
+    print(f"{ROWS} rows")
+    print(f"per-row loop: {loop_seconds:.3f}s ({ROWS / loop_seconds:,.0f} rows/sec), {loop_rejected} rejected")
+    print(f"column-wise:  {frame_seconds:.3f}s ({ROWS / frame_seconds:,.0f} rows/sec), {frame_rejected} rejected")
+    if loop_rejected != frame_rejected:
+        print("MISMATCH: the two paths rejected different row counts")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
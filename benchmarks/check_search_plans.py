@@ -0,0 +1,64 @@
+"""EXPLAIN regression check for search.py page queries.
+
+Every query must read through its search index, never scan the table and
+never sort in a temporary file. Run it against a populated database (a
+near-empty table can make the optimizer prefer a scan):
+
+    IIS_DB_HOST=127.0.0.1 python benchmarks/check_search_plans.py
+
+Exits non-zero if any plan regresses. bench_search.py runs the same check
+against its synthetic table.
+"""
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_connector import pooled_connection
+from schema import COURSES, YEARS
+from search import build_search, explain
+
+# (kind, search arguments, index the plan must use)
+CASES = (
+    ("student", {"surname": "DELA"}, "idx_students_name"),
+    ("student", {"surname": "DELA", "after": ("DELA CRUZ", "Juan", 1000)}, "idx_students_name"),
+    ("student", {"course": COURSES[0], "year": YEARS[0]}, "idx_students_course_year"),
+    ("student", {"course": COURSES[0], "year": YEARS[0], "after": (1000,)}, "idx_students_course_year"),
+    ("employee", {"surname": "DELA"}, "idx_employee_name"),
+    ("employee", {"surname": "DELA", "after": ("DELA CRUZ", "Juan", 1000)}, "idx_employee_name"),
+    ("employee", {"department": "Multimedia", "position": "Staff"}, "idx_employee_department"),
+)
+
+def check_plans(conn, tables=None, kinds=("student", "employee")):
+    """List of failure messages; empty when every plan is as expected.
+
+    tables maps kind -> table name, to check a copy instead of the real table.
+    """
+    failures = []
+    for kind, arguments, index in CASES:
+        if kind not in kinds:
+            continue
+        sql, params, _ = build_search(kind, table=(tables or {}).get(kind), **arguments)
+        for row in explain(conn, sql, params):
+            extra = row.get("Extra") or ""
+            problems = []
+            if row.get("key") != index:
+                problems.append(f"uses {row.get('key') or 'no index'} instead of {index}")
+            if row.get("type") == "ALL":
+                problems.append("scans the whole table")
+            if "filesort" in extra:
+                problems.append("sorts with filesort")
+            if problems:
+                failures.append(f"{kind} {arguments}: " + ", ".join(problems) + f" [{extra}]")
+    return failures
+
+def main():
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            print("Failed to connect to the database.")
+            return 2
+        failures = check_plans(conn)
+    for failure in failures:
+        print("FAIL:", failure)
+    print(f"{len(CASES)} plans checked, {len(failures)} regressions")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Headless soak run of the kiosk: navigate, fill, submit, go back, thousands of times.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/soak.py --cycles 5000
+
+Submissions go to an in-memory stand-in database and result boxes are
+recorded instead of shown. After a warm-up, Python object counts, live Qt
+widgets and RSS are sampled; the run exits non-zero if any of them grows
+past its threshold.
+"""
+import os, sys, gc, time, argparse, tempfile
+from contextlib import contextmanager
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import pymysql
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QThreadPool
+import first_page
+import iisforms
+import submission
+import offline_queue
+
+class FakeCursor:
+    def __init__(self, ids):
+        self.ids = ids
+    def executemany(self, query, rows):
+        for row in rows:
+            if row[0] in self.ids:
+                raise pymysql.err.IntegrityError(1062, f"Duplicate entry '{row[0]}' for key 'id'")
+            self.ids.add(row[0])
+    def execute(self, query, args=None):
+        pass  # the registration counts upsert
+    def close(self):
+        pass
+
+class FakeConnection:
+    """Stand-in database that remembers IDs so duplicates behave like the UNIQUE keys."""
+    def __init__(self):
+        self.ids = set()
+    def cursor(self, *args):
+        return FakeCursor(self.ids)
+    def commit(self):
+        pass
+    def rollback(self):
+        pass
+
+_fake = FakeConnection()
+
+@contextmanager
+def fake_connection(user_role="student"):
+    yield _fake
+
+class MessageRecorder:
+    count = 0
+    @classmethod
+    def information(cls, parent, title, message):
+        cls.count += 1
+    warning = critical = information
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+def fill(form, kind, n):
+    form.surname_edit.setText("DELA CRUZ")
+    form.first_name_edit.setText("juan carlo")
+    form.mi_edit.setText("p")
+    form.barangay_edit.setText("San Isidro")
+    form.town_edit.setText("Santa Ana")
+    form.province_edit.setText("Pampanga")
+    form.record_id_edit.setText(f"SOAK-{kind}-{n}")
+    form.emergency_name_edit.setText("Maria Dela Cruz")
+    form.emergency_relation_edit.setText("Mother")
+    form.emergency_contact_edit.setText("09171234567")
+    if kind == "employee":
+        form.department_edit.setText("Multimedia")
+        form.position_edit.setText("Staff")
+
+def cycle(app, window, n):
+    kind = ("student", "employee")[n % 2]
+    if kind == "student":
+        window.landing.stud_registration()
+    else:
+        window.landing.emp_registration()
+    form = window.forms[kind]
+    # Every fifth cycle resubmits the previous ID of the same kind to exercise duplicates
+    fill(form, kind, n - 2 if n % 5 == 0 and n >= 2 else n)
+    form.submit_button.click()
+    while form._in_flight:
+        QThreadPool.globalInstance().waitForDone(50)
+        app.processEvents()
+    form.go_back()
+    app.processEvents()
+
+def sample():
+    gc.collect()
+    return len(gc.get_objects()), len(QApplication.allWidgets()), rss_mb()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--max-object-growth", type=int, default=2000)
+    parser.add_argument("--max-widget-growth", type=int, default=0)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    submission.pooled_connection = fake_connection
+    iisforms.QMessageBox = MessageRecorder
+    journal = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+    journal.close()
+    offline_queue._queue = offline_queue.OfflineQueue(journal.name)
+
+    app = QApplication(sys.argv)
+    window = first_page.MainWindow(warm_up=False)
+    app.processEvents()
+    try:
+        for n in range(args.warmup):
+            cycle(app, window, n)
+        base_objects, base_widgets, base_rss = sample()
+        start = time.perf_counter()
+        for n in range(args.warmup, args.warmup + args.cycles):
+            cycle(app, window, n)
+            if (n - args.warmup + 1) % 500 == 0:
+                objects, widgets, rss = sample()
+                print(f"cycle {n - args.warmup + 1:6d}: objects {objects - base_objects:+6d}  "
+                      f"widgets {widgets - base_widgets:+4d}  rss {rss - base_rss:+7.1f} MB")
+        elapsed = time.perf_counter() - start
+        objects, widgets, rss = sample()
+    finally:
+        os.remove(journal.name)
+
+    print(f"{args.cycles} cycles in {elapsed:.1f}s, {MessageRecorder.count} result boxes")
+    failures = []
+    if objects - base_objects > args.max_object_growth:
+        failures.append(f"Python objects grew by {objects - base_objects}")
+    if widgets - base_widgets > args.max_widget_growth:
+        failures.append(f"Qt widgets grew by {widgets - base_widgets}")
+    if rss - base_rss > args.max_rss_growth_mb:
+        failures.append(f"RSS grew by {rss - base_rss:.1f} MB")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Column-wise normalization and validation of whole spreadsheets with pandas.
+
+The same rules as registration.normalize_fields/validate_fields (and so the
+forms), applied one column at a time instead of one row at a time:
+
+    frame = normalize_frame("student", read_frame("students.xlsx"))
+    errors = validate_frame("student", frame)   # one bool column per rule
+    good = frame[~errors.any(axis=1)]
+"""
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from schema import KINDS, ADDRESS, ADDRESS_COLUMN
+from registration import clean_text
+from importer import field_name
+
+# Spreadsheet row number of frame index 0 (row 1 is the header)
+FIRST_ROW = 2
+
+def read_frame(path):
+    """Every cell as text, headers mapped to field names like importer.iter_rows does."""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        frame = pd.read_excel(path, dtype=str, keep_default_na=False)
+    else:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False, skip_blank_lines=False,
+                            encoding="utf-8-sig")
+    frame.columns = [field_name(column) for column in frame.columns]
+    # Drop blank rows but keep the index, so index + FIRST_ROW is still the spreadsheet row
+    return frame[(frame != "").any(axis=1)]
+
+# --- Column rules, mirroring registration.CASE_RULES ---
+def clean_column(series):
+    """registration.clean_text over a whole column, so the Ñ/ñ handling is the same one."""
+    if is_numeric_dtype(series):
+        # Integer cells that pandas read as floats: 9171234567.0 -> "9171234567"
+        series = series.astype("Int64")
+    # A plain comprehension beats the .str accessor here, which also loops in Python
+    values = series.astype(object).where(series.notna(), None).tolist()
+    return pd.Series([clean_text(value) for value in values], index=series.index, dtype=object)
+
+def upper_column(series):
+    return series.str.upper()
+
+def words_column(series):
+    # str.capitalize (title case for the first letter) on every space-separated word, as capitalize_words does
+    return series.str.lower().str.replace(r"(?:^| )\S", lambda m: m.group(0).title(), regex=True)
+
+def initial_column(series):
+    return (series.str[:1].str.upper() + ".").where(series != "", "")
+
+def digits_column(series):
+    digits = series.str.replace(r"\D", "", regex=True)
+    # Mobile numbers stored as integers lose their leading zero
+    dropped_zero = (digits.str.len() == 10) & digits.str.startswith("9")
+    return digits.where(~dropped_zero, "0" + digits)
+
+COLUMN_RULES = {
+    "upper": upper_column,
+    "words": words_column,
+    "initial": initial_column,
+    "digits": digits_column,
+}
+
+def normalize_column(series, rule=None):
+    """Clean a column, then apply rule; each distinct value is worked on only once."""
+    if is_numeric_dtype(series):
+        series = series.astype("Int64")
+    # Towns, provinces, courses and years repeat on nearly every row
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    values = clean_column(pd.Series(uniques))
+    if rule:
+        values = rule(values)
+    return pd.Series(values.to_numpy(dtype=object).take(codes), index=series.index, dtype=object)
+
+def normalize_frame(kind, frame):
+    """New frame of cleaned text with every schema field present and the field rules applied."""
+    rules = {field.name: COLUMN_RULES.get(field.case) for field in KINDS[kind].fields}
+    frame = pd.DataFrame({column: normalize_column(frame[column], rules.get(column))
+                          for column in frame.columns}, index=frame.index)
+    for name in rules:
+        if name not in frame:
+            frame[name] = ""
+    return frame
+
+# --- Validation ---
+MISSING = "missing"
+LENGTH = "length"
+DUPLICATE = "duplicate"
+
+def validate_frame(kind, frame):
+    """Boolean error mask: one column per rule, named like ("missing", "surname"); True = failed.
+
+    errors.any(axis=1) is the per-row mask of rows that cannot be inserted.
+    """
+    spec = KINDS[kind]
+    mask = {}
+    for field in spec.required:
+        mask[MISSING, field.name] = frame[field.name] == ""
+    for field in spec.fields:
+        if field.case == "digits" and field.max_length:
+            values = frame[field.name]
+            mask[LENGTH, field.name] = (values != "") & (values.str.len() != field.max_length)
+    ids = frame[spec.id_column]
+    mask[DUPLICATE, spec.id_column] = (ids != "") & ids.duplicated(keep="first")
+    return pd.DataFrame(mask, index=frame.index)
+
+def error_messages(kind, errors):
+    """Messages for the failing rows only, worded like registration.validate_fields."""
+    spec = KINDS[kind]
+    labels = {field.name: field.label for field in spec.fields}
+    failing = errors[errors.any(axis=1)]
+    messages = {}
+    for index, row in zip(failing.index, failing.itertuples(index=False)):
+        failed = [rule for rule, hit in zip(failing.columns, row) if hit]
+        parts = []
+        missing = [labels[name] for kind_of, name in failed if kind_of == MISSING]
+        if missing:
+            parts.append("Please complete all required fields: " + ", ".join(missing))
+        for kind_of, name in failed:
+            if kind_of == LENGTH:
+                field = next(f for f in spec.fields if f.name == name)
+                parts.append(f"{field.label} must be exactly {field.max_length} digits.")
+            elif kind_of == DUPLICATE:
+                parts.append("Duplicate ID in file")
+        messages[index] = " ".join(parts)
+    return pd.Series(messages, index=failing.index, dtype=object)
+
+def frame_records(kind, frame):
+    """Compact records (schema Record namedtuples) for the rows of a normalized frame."""
+    spec = KINDS[kind]
+    columns = {}
+    for column in spec.columns:
+        if column == ADDRESS_COLUMN:
+            parts = [frame[f.name] for f in spec.form_fields(ADDRESS)]
+            joined = parts[0].str.cat(parts[1:], sep=", ")
+            if ADDRESS_COLUMN in frame:
+                joined = frame[ADDRESS_COLUMN].where(frame[ADDRESS_COLUMN] != "", joined)
+            columns[column] = joined.tolist()
+        else:
+            columns[column] = frame[column].tolist()
+    return list(map(spec.Record._make, zip(*columns.values())))
@@ -0,0 +1,312 @@
+import os
+import time
+import atexit
+import random
+import threading
+from contextlib import contextmanager
+import pymysql
+import pymysql.cursors
+import db_timing
+
+DB_HOST = os.environ.get("IIS_DB_HOST", "172.16.1.32")
+DB_PORT = int(os.environ.get("IIS_DB_PORT", "3306"))
+DB_NAME = os.environ.get("IIS_DB_NAME", "iis")
+
+def _seconds(name, default):
+    """Timeout from the environment; blank means no limit."""
+    value = os.environ.get(name, default).strip()
+    return float(value) if value else None
+
+# Without timeouts a dead or half-open server blocks for the OS TCP timeout.
+# The connect timeout covers the whole handshake, for every role.
+CONNECT_TIMEOUT = _seconds("IIS_DB_CONNECT_TIMEOUT", "3")
+# Kiosk roles only run single-row statements, so a slow answer means trouble.
+READ_TIMEOUT = _seconds("IIS_DB_READ_TIMEOUT", "10")
+WRITE_TIMEOUT = _seconds("IIS_DB_WRITE_TIMEOUT", "10")
+# Admin work (migrations, exports, stats rebuilds, duplicate reports) may run for minutes
+ADMIN_READ_TIMEOUT = _seconds("IIS_DB_ADMIN_READ_TIMEOUT", "")
+ADMIN_WRITE_TIMEOUT = _seconds("IIS_DB_ADMIN_WRITE_TIMEOUT", "")
+CONNECT_ATTEMPTS = int(os.environ.get("IIS_DB_CONNECT_ATTEMPTS", "2"))
+RETRY_BASE_DELAY = 0.2
+
+# Errors that say the server is unreachable or overloaded, not that the request was wrong:
+# too many connections, can't connect (socket/TCP), unknown host, server gone away, lost connection
+TRANSIENT_ERRORS = {1040, 2002, 2003, 2005, 2006, 2013}
+
+def _credentials(user_role):
+    if user_role.lower() == "admin":
+        return "adminuser", "adminpassword"
+    return "clientuser", "clientpassword"
+
+def is_transient(error):
+    return (isinstance(error, pymysql.err.OperationalError) and bool(error.args)
+            and error.args[0] in TRANSIENT_ERRORS)
+
+def _timeouts(user_role):
+    """(read, write) timeouts for a role's queries; None is no limit."""
+    if user_role.lower() == "admin":
+        return ADMIN_READ_TIMEOUT, ADMIN_WRITE_TIMEOUT
+    return READ_TIMEOUT, WRITE_TIMEOUT
+
+def _open_connection(user_role):
+    username, password = _credentials(user_role)
+    read_timeout, write_timeout = _timeouts(user_role)
+    return db_timing.TimedConnection(
+        host=DB_HOST,
+        port=DB_PORT,
+        user=username,
+        password=password,
+        database=DB_NAME,
+        cursorclass=pymysql.cursors.DictCursor,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=read_timeout,
+        write_timeout=write_timeout
+    )
+
+# --- Circuit breaker ---
+class CircuitBreaker:
+    """Stops connection attempts once the server is known to be down.
+
+    CLOSED: connections are attempted. After failure_threshold transient
+    failures in a row it turns OPEN: connect_to_database returns None at
+    once and a background thread probes the server, backing off with
+    jitter up to max_probe_interval. While a probe is in progress the state
+    is HALF_OPEN; a successful probe closes the breaker again. Listeners
+    are called with the new state from whichever thread changed it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, probe_interval=2, max_probe_interval=30, probe=None):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self._probe = probe or self._probe_server
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probe_role = "student"
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def allow(self):
+        """False while the server is known to be down: fail fast."""
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            changed = self.state != self.CLOSED
+            self.state = self.CLOSED
+        if changed:
+            print("Database reachable again")
+            self._notify()
+
+    def record_failure(self, user_role="student"):
+        with self._lock:
+            self._failures += 1
+            if self.state != self.CLOSED or self._failures < self.failure_threshold:
+                return
+            self.state = self.OPEN
+            self._probe_role = user_role
+        print(f"Database unreachable; failing fast and probing every {self.probe_interval}s or more")
+        self._notify()
+        threading.Thread(target=self._probe_until_closed, name="db-breaker-probe", daemon=True).start()
+
+    def _set_state(self, state):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            self.state = state
+        self._notify()
+        return True
+
+    def _probe_until_closed(self):
+        interval = self.probe_interval
+        while True:
+            # Jitter so a room of kiosks does not probe in lockstep
+            time.sleep(random.uniform(interval / 2, interval))
+            if not self._set_state(self.HALF_OPEN):
+                return
+            if self._probe(self._probe_role):
+                self.record_success()
+                return
+            if not self._set_state(self.OPEN):
+                return
+            interval = min(interval * 2, self.max_probe_interval)
+
+    @staticmethod
+    def _probe_server(user_role):
+        try:
+            _open_connection(user_role).close()
+            return True
+        except Exception:
+            return False
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback(self.state)
+            except Exception as e:
+                print(f"Breaker listener failed: {e}")
+
+breaker = CircuitBreaker()
+
+def connect_to_database(user_role="student"):
+    """Open a new connection for the given role, or return None on failure.
+
+    Transient failures are retried with jittered exponential backoff; while
+    the breaker is open no attempt is made at all.
+    """
+    for attempt in range(CONNECT_ATTEMPTS):
+        if not breaker.allow():
+            return None
+        try:
+            conn = _open_connection(user_role)
+        except Exception as e:
+            if not is_transient(e):
+                print(f"Database connection failed: {e}")
+                return None
+            breaker.record_failure(user_role)
+            if attempt + 1 == CONNECT_ATTEMPTS:
+                print(f"Database connection failed: {e}")
+                return None
+            time.sleep(random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt))
+        else:
+            breaker.record_success()
+            return conn
+    return None
+
+# --- Connection pool ---
+class ConnectionPool:
+    """A small bounded pool of connections for one user role.
+
+    Idle connections are reused most-recently-used first, pinged before being
+    handed out, and closed once they have sat unused for idle_timeout seconds.
+    While the circuit breaker is open acquire() returns None straight away.
+    """
+    def __init__(self, user_role, max_size=4, idle_timeout=300, acquire_timeout=10):
+        self.user_role = user_role
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle = []  # (conn, last_used) pairs, most recent last
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def _evict_idle(self):
+        # Called with the lock held; the oldest entries sit at the front.
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.pop(0)
+            self._close_quietly(conn)
+
+    def acquire(self):
+        with db_timing.timed("pool_wait"):
+            return self._acquire()
+
+    def _acquire(self):
+        # Fail fast while the server is known to be down: not even a ping on an idle connection
+        if not breaker.allow():
+            return None
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                    break
+                if self._in_use < self.max_size:
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        if conn is not None:
+            try:
+                # Reconnecting is left to connect_to_database, which retries and asks the breaker
+                conn.ping(reconnect=False)
+            except Exception as e:
+                if is_transient(e):
+                    breaker.record_failure(self.user_role)
+                self._close_quietly(conn)
+                conn = None
+        if conn is None:
+            conn = connect_to_database(user_role=self.user_role)
+            if conn is None:
+                with self._cond:
+                    self._in_use -= 1
+                    self._cond.notify()
+        return conn
+
+    def release(self, conn, discard=False):
+        if not discard and getattr(conn, "dirty", True):
+            try:
+                # Never hand the next caller an open transaction; after a clean commit there is none
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard or len(self._idle) >= self.max_size:
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(user_role="student"):
+    key = user_role.lower()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+@contextmanager
+def pooled_connection(user_role="student"):
+    """Borrow a pooled connection; yields None if no connection could be made."""
+    pool = get_pool(user_role)
+    conn = pool.acquire()
+    if conn is None:
+        yield None
+        return
+    discard = False
+    try:
+        yield conn
+    except pymysql.err.OperationalError as e:
+        discard = True
+        if is_transient(e):
+            # A read or write timeout on an open connection counts against the server too
+            breaker.record_failure(user_role)
+        raise
+    finally:
+        pool.release(conn, discard=discard)
+
+@atexit.register
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
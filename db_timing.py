@@ -0,0 +1,226 @@
+"""Timing of every database operation: histograms, a slow-operation log and summaries.
+
+db_connector opens TimedConnection instead of a plain pymysql connection,
+so every connect, statement, commit, rollback and ping is measured,
+whatever cursor class runs it, and so is the wait for a pooled connection.
+Operation names:
+
+    connect, pool_wait, ping, commit, rollback, query.select, query.insert, ...
+
+Slow or failed operations go to db_slow.log next to the executable (or
+this file when run from source), rotated at 1 MB. IIS_DB_SLOW_MS sets the
+threshold (default 500). A p50/p95/p99 summary is written to the same log
+at exit; dump_summary() prints and logs it on demand. In the kiosk app
+Ctrl+Shift+D shows it (on any platform), and so does SIGUSR1 on Linux and
+macOS once install_signal_handler() has run on the main thread.
+
+Telling the usual suspects apart: slow connect is network or DNS, failed
+connect with error 1045 is authentication, slow query.insert or commit with
+fast query.select is lock contention, and a long pool_wait means the pool
+is too small for the load.
+"""
+import os, re, sys, math, time, atexit, signal, logging, threading
+from logging.handlers import RotatingFileHandler
+import pymysql
+from pymysql.connections import Connection
+
+SLOW_MS = float(os.environ.get("IIS_DB_SLOW_MS", "500"))
+
+def log_path():
+    """The slow log lives next to the executable (or this file when run from source)."""
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(os.path.dirname(__file__))
+    return os.path.join(base_path, "db_slow.log")
+
+# --- Histograms ---
+class Histogram:
+    """Log-scale latency histogram: buckets grow by 10% from 0.1 ms, so percentiles are within 10%."""
+    LOWEST = 0.0001  # seconds
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, seconds):
+        if seconds <= self.LOWEST:
+            return 0
+        return int(math.log(seconds / self.LOWEST, self.GROWTH)) + 1
+
+    def record(self, seconds):
+        bucket = self._bucket(seconds)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.LOWEST * self.GROWTH ** bucket, self.max)
+        return self.max
+
+_histograms = {}
+_errors = {}  # (operation, error code) -> count
+_lock = threading.Lock()
+
+_slow_log = logging.getLogger("iis.db_slow")
+_slow_log.propagate = False
+_slow_log_ready = False
+
+def _slow_logger():
+    global _slow_log_ready
+    if not _slow_log_ready:
+        _slow_log_ready = True
+        try:
+            handler = RotatingFileHandler(log_path(), maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")
+        except OSError as e:
+            print(f"Slow-operation log unavailable: {e}")
+            handler = logging.NullHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _slow_log.addHandler(handler)
+        _slow_log.setLevel(logging.INFO)
+    return _slow_log
+
+# Quoted values and numbers, so names and contact numbers never reach the log
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+\b")
+
+def _error_code(error):
+    if isinstance(error, pymysql.err.MySQLError) and error.args and isinstance(error.args[0], int):
+        return error.args[0]
+    return type(error).__name__
+
+def record(operation, seconds, error=None, detail=""):
+    """Add one measurement; slow or failed operations are also logged."""
+    with _lock:
+        histogram = _histograms.get(operation)
+        if histogram is None:
+            histogram = _histograms[operation] = Histogram()
+        histogram.record(seconds)
+        if error is not None:
+            key = (operation, _error_code(error))
+            _errors[key] = _errors.get(key, 0) + 1
+    if error is not None or seconds * 1000 >= SLOW_MS:
+        message = f"{operation} {seconds * 1000:.1f}ms"
+        if error is not None:
+            message += f" error={_error_code(error)} {error}"
+        if detail:
+            message += f" | {_LITERALS.sub('?', ' '.join(detail.split()))[:300]}"
+        _slow_logger().info(message)
+
+class timed:
+    """Context manager that records how long its block took under operation."""
+    def __init__(self, operation, detail=""):
+        self.operation = operation
+        self.detail = detail
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.operation, time.perf_counter() - self.start, exc, self.detail)
+        return False
+
+def _query_operation(sql):
+    if isinstance(sql, bytes):
+        sql = sql[:20].decode("utf-8", "replace")
+    verb = sql.lstrip()[:20].split(None, 1)
+    return "query." + (verb[0].lower() if verb else "empty")
+
+class TimedConnection(Connection):
+    """pymysql connection that times its round trips; every cursor class goes through query().
+
+    pymysql reads and writes the handshake under read_timeout/write_timeout;
+    here the whole connect is bounded by connect_timeout instead, and the
+    read and write timeouts only apply to what follows.
+
+    dirty is False only when nothing has run since connecting or the last
+    commit/rollback; ConnectionPool.release skips its rollback then. (pymysql's
+    server_status is not refreshed by result sets, so it cannot tell.)
+    """
+    dirty = True
+
+    def connect(self, sock=None):
+        read_timeout, write_timeout = self._read_timeout, self._write_timeout
+        self._read_timeout = self._write_timeout = self.connect_timeout
+        try:
+            with timed("connect", f"host={self.host} user={self.user}"):
+                super().connect(sock)
+            self.dirty = False
+        finally:
+            # Picked up by the next read or write, which resets the socket timeout when it differs
+            self._read_timeout, self._write_timeout = read_timeout, write_timeout
+
+    def query(self, sql, unbuffered=False):
+        self.dirty = True
+        with timed(_query_operation(sql), sql if isinstance(sql, str) else ""):
+            return super().query(sql, unbuffered)
+
+    def commit(self):
+        with timed("commit"):
+            super().commit()
+        self.dirty = False
+
+    def rollback(self):
+        with timed("rollback"):
+            super().rollback()
+        self.dirty = False
+
+    def ping(self, *args, **kwargs):
+        with timed("ping"):
+            return super().ping(*args, **kwargs)
+
+# --- Summaries ---
+def summary():
+    """Text table of count, p50/p95/p99/max in ms and errors per operation."""
+    with _lock:
+        rows = [(operation, histogram.count, histogram.percentile(50), histogram.percentile(95),
+                 histogram.percentile(99), histogram.max) for operation, histogram in _histograms.items()]
+        errors = dict(_errors)
+    lines = [f"{'operation':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}  errors"]
+    for operation, count, p50, p95, p99, worst in sorted(rows):
+        failed = ", ".join(f"{code}x{n}" for (op, code), n in sorted(errors.items(), key=str) if op == operation)
+        lines.append(f"{operation:<16}{count:>8}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}"
+                     f"{p99 * 1000:>10.1f}{worst * 1000:>10.1f}  {failed}")
+    return "\n".join(lines)
+
+def counts():
+    """{operation: times run} since start or reset()."""
+    with _lock:
+        return {operation: histogram.count for operation, histogram in _histograms.items()}
+
+def dump_summary(file=None):
+    """Print the summary and keep a copy in the slow log (a windowed kiosk has no console)."""
+    text = summary()
+    print(text, file=file or sys.stdout, flush=True)
+    _slow_logger().info("summary on request\n" + text)
+    return text
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _errors.clear()
+
+@atexit.register
+def _summary_at_exit():
+    if _histograms:
+        _slow_logger().info("summary at exit\n" + summary())
+
+def install_signal_handler():
+    """Dump the summary on SIGUSR1; call from the main thread. False where there is no SIGUSR1."""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    signal.signal(signal.SIGUSR1, lambda signum, frame: dump_summary())
+    return True
@@ -0,0 +1,111 @@
+"""Registration counts per day and course/year (department/position for employees).
+
+registration.insert_records bumps registration_counts in the same
+transaction as the rows it inserts, so the counts are exact and reading
+them never touches the registration tables. rebuild() recomputes them
+from scratch (python -m iiscli stats --rebuild), e.g. after rows were
+loaded around insert_records. Keep Qt out of this module.
+"""
+from collections import Counter
+import pymysql
+from schema import KINDS
+
+COUNTS_TABLE = "registration_counts"
+
+# The two columns counted per kind, stored as category/subcategory
+GROUPS = {"student": ("course", "year"), "employee": ("department", "position")}
+
+ER_NO_SUCH_TABLE = 1146
+_missing_table_reported = False
+
+def count_records(kind, records):
+    """Counter of (category, subcategory) over value tuples in TABLES[kind]["columns"] order."""
+    columns = KINDS[kind].columns
+    first, second = (columns.index(name) for name in GROUPS[kind])
+    return Counter((record[first] or "", record[second] or "") for record in records)
+
+def bump_counts(cursor, kind, records):
+    """Add records to today's counts; call inside the insert transaction, before the commit.
+
+    One multi-row upsert per batch. A database without the counts table
+    still takes registrations; the counts are then rebuilt once it exists.
+    """
+    global _missing_table_reported
+    counts = count_records(kind, records)
+    if not counts:
+        return
+    values = []
+    for (category, subcategory), n in counts.items():
+        values += [kind, category, subcategory, n]
+    sql = ("INSERT INTO {} (kind, day, category, subcategory, n) VALUES {} "
+           "ON DUPLICATE KEY UPDATE n = n + VALUES(n)").format(
+               COUNTS_TABLE, ", ".join(["(%s, CURDATE(), %s, %s, %s)"] * len(counts)))
+    try:
+        cursor.execute(sql, values)
+    except pymysql.err.ProgrammingError as e:
+        # MySQL rolls back only this statement; the rows themselves still commit
+        if not e.args or e.args[0] != ER_NO_SUCH_TABLE:
+            raise
+        if not _missing_table_reported:
+            print(f"{COUNTS_TABLE} is missing; registration counts are not being kept")
+            _missing_table_reported = True
+
+def subtract_counts(cursor, kind, where, params=()):
+    """Take the rows matching where off the counts; call in the transaction that deletes them.
+
+    For removing a known set of rows (test or benchmark data) without a full rebuild().
+    """
+    spec = KINDS[kind]
+    category, subcategory = GROUPS[kind]
+    try:
+        cursor.execute(
+            "UPDATE {0} c JOIN (SELECT DATE({1}) AS day, COALESCE({2}, '') AS category, "
+            "COALESCE({3}, '') AS subcategory, COUNT(*) AS n FROM {4} WHERE {5} GROUP BY 1, 2, 3) r "
+            "ON c.kind = %s AND c.day = r.day AND c.category = r.category AND c.subcategory = r.subcategory "
+            "SET c.n = c.n - r.n".format(COUNTS_TABLE, spec.date_column, category, subcategory, spec.table, where),
+            list(params) + [kind])
+        cursor.execute(f"DELETE FROM {COUNTS_TABLE} WHERE kind = %s AND n <= 0", (kind,))
+    except pymysql.err.ProgrammingError as e:
+        if not e.args or e.args[0] != ER_NO_SUCH_TABLE:
+            raise
+
+def rebuild(conn, kind):
+    """Recompute every count for kind from the registration table in one transaction."""
+    spec = KINDS[kind]
+    category, subcategory = GROUPS[kind]
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DELETE FROM {COUNTS_TABLE} WHERE kind = %s", (kind,))
+        cursor.execute(
+            "INSERT INTO {0} (kind, day, category, subcategory, n) "
+            "SELECT %s, DATE({1}), COALESCE({2}, ''), COALESCE({3}, ''), COUNT(*) FROM {4} "
+            "GROUP BY DATE({1}), COALESCE({2}, ''), COALESCE({3}, '')".format(
+                COUNTS_TABLE, spec.date_column, category, subcategory, spec.table), (kind,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def read_counts(conn, kind, since=None, until=None):
+    """{(category, subcategory): n} for days in [since, until]; all days when both are None.
+
+    Reads only the counts table through its primary key, so the cost depends
+    on the number of days and courses covered, never on how many people are
+    registered.
+    """
+    where, params = ["kind = %s"], [kind]
+    if since:
+        where.append("day >= %s")
+        params.append(since)
+    if until:
+        where.append("day <= %s")
+        params.append(until)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT category, subcategory, SUM(n) AS n FROM {} WHERE {} "
+                       "GROUP BY category, subcategory".format(COUNTS_TABLE, " AND ".join(where)), params)
+        return {(row["category"], row["subcategory"]): int(row["n"]) for row in cursor.fetchall()}
+    finally:
+        cursor.close()
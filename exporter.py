@@ -0,0 +1,200 @@
+"""Streaming export of students or employees to XLSX or CSV.
+
+Rows come off an unbuffered server-side cursor and go straight into a
+write-only workbook or a CSV stream, so memory stays flat however large
+the table is:
+
+    python exporter.py student students.xlsx --course "Associate in Computer Technology" --since 2025-06-01
+
+With --incremental the path is a directory: only rows added since the last
+run are written, as numbered delta files a consumer applies in order.
+"""
+import os, sys, csv, json, time, argparse
+import pymysql.cursors
+from db_connector import pooled_connection
+from registration import TABLES
+
+FETCH_SIZE = 1000
+
+def export_columns(kind):
+    spec = TABLES[kind]
+    return ("id",) + spec["columns"] + (spec["date_column"],)
+
+def check_filters(kind, **filters):
+    """Raise ValueError for a filter given a value that kind's table has no column for."""
+    unknown = [column for column, value in filters.items() if value and column not in TABLES[kind]["columns"]]
+    if unknown:
+        raise ValueError(f"{kind} records have no {', '.join(sorted(unknown))} to filter on")
+
+def build_query(kind, course=None, year=None, department=None, since=None, until=None):
+    """SELECT for the export with optional filters; since/until bound the registration date."""
+    spec = TABLES[kind]
+    check_filters(kind, course=course, year=year, department=department)
+    where, params = [], []
+    for column, value in (("course", course), ("year", year), ("department", department)):
+        if value:
+            where.append(f"{column} = %s")
+            params.append(value)
+    if since:
+        where.append(f"{spec['date_column']} >= %s")
+        params.append(since)
+    if until:
+        where.append(f"{spec['date_column']} < %s")
+        params.append(until)
+    sql = "SELECT {} FROM {}".format(", ".join(export_columns(kind)), spec["table"])
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY id", params
+
+def stream_rows(conn, sql, params):
+    """Yield row tuples from an SSCursor in FETCH_SIZE batches."""
+    cursor = conn.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+def write_rows(path, header, rows, sheet_title="Export"):
+    """Write header + rows to path (.xlsx or .csv); returns the number of data rows."""
+    count = 0
+    if path.lower().endswith(".xlsx"):
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+            count += 1
+        workbook.save(path)
+    else:
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    return count
+
+def export(kind, path, **filters):
+    """Export the rows of kind matching filters to path; returns the number of rows written."""
+    sql, params = build_query(kind, **filters)
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        return write_rows(path, export_columns(kind), stream_rows(conn, sql, params),
+                          sheet_title=TABLES[kind]["table"])
+
+# --- Incremental (watermark) export ---
+def load_watermarks(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_watermarks(path, watermarks):
+    # Write then rename so a crash never leaves a half-written state file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(tmp_path, path)
+
+def build_delta_query(kind, watermark, settle_seconds):
+    """Rows after (date, id) in keyset order, leaving out the last settle_seconds.
+
+    Rows from transactions that commit a little late carry an earlier
+    timestamp, so the newest rows are left for the next run rather than
+    skipped forever.
+    """
+    spec = TABLES[kind]
+    date_column = spec["date_column"]
+    where = [f"{date_column} < NOW() - INTERVAL %s SECOND"]
+    params = [settle_seconds]
+    if watermark:
+        where.append(f"({date_column} > %s OR ({date_column} = %s AND id > %s))")
+        params += [watermark["date"], watermark["date"], watermark["id"]]
+    sql = "SELECT {} FROM {} WHERE {} ORDER BY {}, id".format(
+        ", ".join(export_columns(kind)), spec["table"], " AND ".join(where), date_column)
+    return sql, params
+
+def export_incremental(kind, out_dir, settle_seconds=60, extension="csv"):
+    """Write the rows added since the last run to the next delta file in out_dir.
+
+    The watermark (registration time + id of the last exported row) is kept
+    per table in out_dir/watermarks.json and only advances once the delta
+    file has been written. Returns (path, rows); path is None when there
+    was nothing new.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    state_path = os.path.join(out_dir, "watermarks.json")
+    watermarks = load_watermarks(state_path)
+    table = TABLES[kind]["table"]
+    state = watermarks.get(table, {"sequence": 0, "watermark": None})
+    sql, params = build_delta_query(kind, state["watermark"], settle_seconds)
+
+    sequence = state["sequence"] + 1
+    path = os.path.join(out_dir, f"{table}-{sequence:06d}.{extension}")
+    last = []
+
+    def tracked(rows):
+        for row in rows:
+            last[:] = [row]
+            yield row
+
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        count = write_rows(path, export_columns(kind), tracked(stream_rows(conn, sql, params)),
+                           sheet_title=table)
+    if not count:
+        os.remove(path)
+        return None, 0
+
+    row = last[0]
+    watermarks[table] = {"sequence": sequence,
+                         "watermark": {"date": str(row[-1]), "id": row[0]}}
+    save_watermarks(state_path, watermarks)
+    return path, count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export student or employee registrations to XLSX/CSV.")
+    parser.add_argument("kind", choices=sorted(TABLES))
+    parser.add_argument("path", help="output file; .xlsx for a workbook, anything else for CSV "
+                                     "(a directory with --incremental)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="write only rows added since the last incremental run")
+    parser.add_argument("--format", choices=("csv", "xlsx"), default="csv",
+                        help="delta file format for --incremental")
+    parser.add_argument("--course")
+    parser.add_argument("--year")
+    parser.add_argument("--department")
+    parser.add_argument("--since", help="registered on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="registered before this date (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    try:
+        check_filters(args.kind, course=args.course, year=args.year, department=args.department)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    if args.incremental:
+        path, count = export_incremental(args.kind, args.path, extension=args.format)
+        elapsed = time.perf_counter() - start
+        if path is None:
+            print(f"No new rows since the last export ({elapsed:.2f}s)")
+        else:
+            print(f"{count} new rows written to {path} in {elapsed:.2f}s")
+        return 0
+    count = export(args.kind, args.path, course=args.course, year=args.year,
+                   department=args.department, since=args.since, until=args.until)
+    elapsed = time.perf_counter() - start
+    print(f"{count} rows written to {args.path} in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:.0f} rows/sec)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
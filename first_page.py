@@ -1,16 +1,10 @@
-import os, sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
-from PyQt5.QtGui     import QFont, QIcon, QPixmap, QPainter, QPainterPath, QFontMetrics, QPen
-from PyQt5.QtCore    import Qt
-import iisforms
-
-def resource_path(relative_path):
-    """Get absolute path to resource, works for dev and for PyInstaller."""
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.abspath(os.path.dirname(__file__))
-    return os.path.join(base_path, relative_path)
+import sys, html, threading
+from PyQt5.QtWidgets import QApplication, QWidget, QStackedWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox, QShortcut
+from PyQt5.QtGui     import QFont, QIcon, QPixmap, QPainter, QPainterPath, QFontMetrics, QPen, QKeySequence
+from PyQt5.QtCore    import Qt, QTimer, pyqtSignal
+import assets
+# The forms, the DB driver and the data libraries are imported on first use
+# (or warmed up after the first paint) so the landing page shows quickly.
 
 class StrokeLabel(QLabel):
     def __init__(self, text="", parent=None,
@@ -22,8 +16,14 @@ class StrokeLabel(QLabel):
         self._text_color = text_color
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.setStyleSheet("background: transparent;")
-    def paintEvent(self, event):
-        painter = QPainter(self)
+        self._cache = None
+        self._cache_key = None
+
+    def _render(self):
+        # Text outline and fill drawn once into a transparent pixmap
+        cache = QPixmap(self.size())
+        cache.fill(Qt.transparent)
+        painter = QPainter(cache)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.TextAntialiasing)
         fm = QFontMetrics(self.font())
@@ -40,19 +40,33 @@ class StrokeLabel(QLabel):
         painter.setPen(Qt.NoPen)
         painter.setBrush(self._text_color)
         painter.drawPath(path)
+        painter.end()
+        return cache
+
+    def paintEvent(self, event):
+        # Rebuilt only when the text, font or size changes; otherwise one blit
+        key = (self.text(), self.font().key(), self.width(), self.height())
+        if key != self._cache_key:
+            self._cache = self._render()
+            self._cache_key = key
+        painter = QPainter(self)
+        painter.drawPixmap(event.rect(), self._cache, event.rect())
 
 class Page(QWidget):
+    student_requested = pyqtSignal()
+    employee_requested = pyqtSignal()
+    first_painted = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Identification and Information System")
-        self.setGeometry(275, 70, 900, 600)
-        self.showMaximized()
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self._background = None  # faded background, rendered per window size
+        self._painted = False
 
-        # Load images via resource_path
-        self.bg_image   = QPixmap(resource_path("arial.jpg"))
+        # Images come from the shared cache, decoded once per process
         self.logo_label = QLabel(self)
-        logo_pixmap    = QPixmap(resource_path("hcc-logo.png"))
-        self.logo_label.setPixmap(logo_pixmap)
+        self.logo_label.setPixmap(assets.pixmap("hcc-logo.png", assets.LOGO_SIZE))
         self.logo_label.setScaledContents(True)
         self.logo_label.setFixedSize(250, 250)
         self.logo_label.setStyleSheet("background: transparent; margin: 25px;")
@@ -99,26 +113,118 @@ class Page(QWidget):
         self.setLayout(layout)
 
     def stud_registration(self):
-        self.reg_form = iisforms.StudentInformationForm()
-        self.reg_form.show()
-        self.close()
+        self.student_requested.emit()
 
     def emp_registration(self):
-        self.reg_form = iisforms.EmployeeInformationForm()
-        self.reg_form.show()
-        self.close()
+        self.employee_requested.emit()
+
+    def _render_background(self):
+        # The photo faded to 30% once per window size, so a repaint is a single blit
+        background = QPixmap(self.size())
+        background.fill(Qt.transparent)
+        bg_image = assets.pixmap("arial.jpg", self.size())
+        if not bg_image.isNull():
+            painter = QPainter(background)
+            painter.setOpacity(0.3)
+            painter.drawPixmap(0, 0, bg_image)
+            painter.end()
+        return background
 
     def paintEvent(self, event):
+        if self._background is None or self._background.size() != self.size():
+            self._background = self._render_background()
         painter = QPainter(self)
-        painter.setOpacity(0.3)
-        if not self.bg_image.isNull():
-            painter.drawPixmap(self.rect(), self.bg_image)
+        painter.drawPixmap(event.rect(), self._background, event.rect())
         super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            # Let this frame reach the screen before anyone reacts
+            QTimer.singleShot(0, self.first_painted.emit)
+
+def start_background_services():
+    """Loads the DB side and starts the offline replayer and ID index refresher."""
+    import offline_queue
+    import id_index
+    offline_queue.start_replayer()
+    id_index.start_refresher()
+
+# --- The one top-level window ---
+class MainWindow(QStackedWidget):
+    """Keeps the landing page and both forms alive and switches between them."""
+    FORM_CLASSES = {
+        "student": "StudentInformationForm",
+        "employee": "EmployeeInformationForm",
+    }
+
+    def __init__(self, warm_up=True):
+        super().__init__()
+        self.setAttribute(Qt.WA_DeleteOnClose, True)
+        self.setGeometry(275, 70, 900, 600)
+        self.landing = Page()
+        self.landing.student_requested.connect(lambda: self.show_form("student"))
+        self.landing.employee_requested.connect(lambda: self.show_form("employee"))
+        self.addWidget(self.landing)
+        if warm_up:
+            self.landing.first_painted.connect(self.warm_up)
+        # Database timing summary for staff chasing a slow kiosk (see db_timing)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_db_timings)
+        self._signal_timer = None
+        self.forms = {}
+        self.show_landing()
+        self.showMaximized()
+
+    def form(self, kind):
+        """The form for kind, built the first time it is needed."""
+        form = self.forms.get(kind)
+        if form is None:
+            import iisforms
+            form = getattr(iisforms, self.FORM_CLASSES[kind])()
+            form.back_requested.connect(self.show_landing)
+            self.addWidget(form)
+            self.forms[kind] = form
+        return form
+
+    def warm_up(self):
+        """After the first paint: DB services on a thread, then the forms module while idle."""
+        threading.Thread(target=start_background_services, name="warm-up", daemon=True).start()
+        QTimer.singleShot(100, self._import_forms)
+        QTimer.singleShot(200, self._install_signal_handler)
+
+    def _import_forms(self):
+        import iisforms  # loaded now so the first Student/Employee click is instant
+
+    def _install_signal_handler(self):
+        """kill -USR1 dumps the timing summary; signal handlers can only be set here, on the main thread."""
+        import db_timing
+        if db_timing.install_signal_handler():
+            # Python runs signal handlers only between bytecodes, never while Qt's loop idles in C++
+            self._signal_timer = QTimer(self)
+            self._signal_timer.timeout.connect(lambda: None)
+            self._signal_timer.start(500)
+
+    def show_db_timings(self):
+        import db_timing
+        box = QMessageBox(self)
+        box.setWindowTitle("Database timings")
+        box.setText(f"<pre>{html.escape(db_timing.dump_summary())}</pre>")
+        box.exec_()
+
+    def show_form(self, kind):
+        form = self.form(kind)
+        form.reset()
+        self._switch_to(form)
+
+    def show_landing(self):
+        self._switch_to(self.landing)
+
+    def _switch_to(self, widget):
+        self.setCurrentWidget(widget)
+        self.setWindowTitle(widget.windowTitle())
 
 def open_app_landing():
     app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(resource_path("mmd-logo.png")))
-    window = Page()
+    app.setWindowIcon(QIcon(assets.pixmap("mmd-logo.png")))
+    window = MainWindow()
     window.show()
     sys.exit(app.exec_())
 
@@ -5,7 +5,7 @@ a = Analysis(
     ['first_page.py'],
     pathex=[],
     binaries=[],
-    datas=[('arial.jpg', '.'), ('hcc-logo.png', '.'), ('mmd-logo.png', '.')],
+    datas=[('arial.jpg', '.'), ('hcc-logo.png', '.'), ('mmd-logo.png', '.'), ('gazetteer.dat', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
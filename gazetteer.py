@@ -0,0 +1,157 @@
+"""Province / town / barangay suggestions for the address fields, from a bundled gazetteer.
+
+gazetteer.dat is built from gazetteer.csv (province,town,barangay; blank
+town or barangay for the levels above) and shipped with the app:
+
+    python gazetteer.py build [gazetteer.csv] [gazetteer.dat]
+
+It holds one sorted line per place, keyed by level, parents and the folded
+name (upper case, no accents or punctuation, Sta./Sto. spelled out, so
+"sto. nino" finds "Santo Niño"). Lookups memory-map the file on first use
+and binary-search it for the prefix, so nothing is read at startup and only
+the pages a search touches are ever loaded. Keep Qt out of this module:
+
+    gazetteer = get_gazetteer()
+    gazetteer.towns("sta")                 # [("Santa Ana", "Pampanga"), ...]
+    gazetteer.barangays("san", "Santa Ana", "Pampanga")
+"""
+import os, re, sys, csv, mmap, threading, unicodedata
+
+SUGGESTIONS = 10
+
+def gazetteer_path():
+    """Bundled with the app (next to this file when run from source)."""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.abspath(os.path.dirname(__file__))
+    return os.path.join(base_path, "gazetteer.dat")
+
+# Key prefixes per level; towns are indexed twice, on their own and under their province
+PROVINCE = "P"
+TOWN = "T"
+PROVINCE_TOWN = "PT"
+BARANGAY = "B"
+
+# Abbreviations written either way in addresses
+ABBREVIATIONS = {"STA": "SANTA", "STO": "SANTO"}
+
+def fold(text):
+    """Matching form of a place name: "Sto. Niño" -> "SANTO NINO"."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(ABBREVIATIONS.get(word, word) for word in re.sub(r"[^\w ]", " ", text.upper()).split())
+
+def _key(level, *parts):
+    return "|".join((level,) + tuple(fold(part) for part in parts))
+
+# --- Building ---
+def build(source, target):
+    """Write the sorted index for a province,town,barangay CSV; returns the number of lines."""
+    lines = set()
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            province = (row.get("province") or "").strip()
+            town = (row.get("town") or "").strip()
+            barangay = (row.get("barangay") or "").strip()
+            if not province:
+                continue
+            lines.add((_key(PROVINCE, province), province, ""))
+            if town:
+                lines.add((_key(TOWN, town, province), town, province))
+                lines.add((_key(PROVINCE_TOWN, province, town), town, province))
+            if town and barangay:
+                lines.add((_key(BARANGAY, province, town, barangay), barangay, town))
+    data = "".join(f"{key}\t{name}\t{parent}\n" for key, name, parent in sorted(lines))
+    tmp_path = target + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data.encode("utf-8"))
+    os.replace(tmp_path, target)
+    return len(lines)
+
+# --- Lookups ---
+class Gazetteer:
+    """Prefix search over a built gazetteer file, memory-mapped on first use."""
+    def __init__(self, path=None):
+        self.path = path or gazetteer_path()
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _mapped(self):
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    try:
+                        with open(self.path, "rb") as f:
+                            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError) as e:
+                        # Missing or empty file: the fields simply stay free text
+                        print(f"Address suggestions unavailable: {e}")
+                        self._data = b""
+        return self._data
+
+    def _search(self, prefix, limit):
+        """(name, parent) of the lines whose key starts with prefix, in key order."""
+        data = self._mapped()
+        prefix = prefix.encode("utf-8")
+        # Lower bound over whole lines: lines before lo have keys below the prefix
+        lo, hi = 0, len(data)
+        while lo < hi:
+            start = data.rfind(b"\n", lo, (lo + hi) // 2) + 1 or lo
+            end = data.find(b"\n", start)
+            if data[start:data.find(b"\t", start, end)] < prefix:
+                lo = end + 1
+            else:
+                hi = start
+        found = []
+        while lo < len(data) and len(found) < limit:
+            end = data.find(b"\n", lo)
+            key, name, parent = data[lo:end].decode("utf-8").split("\t")
+            if not key.encode("utf-8").startswith(prefix):
+                break
+            found.append((name, parent))
+            lo = end + 1
+        return found
+
+    def provinces(self, prefix="", limit=SUGGESTIONS):
+        return [name for name, _ in self._search(_key(PROVINCE, prefix), limit)]
+
+    def towns(self, prefix="", province="", limit=SUGGESTIONS):
+        """(town, province) pairs; only that province's towns when one is given."""
+        if province:
+            return self._search(_key(PROVINCE_TOWN, province, prefix), limit)
+        return self._search(_key(TOWN, prefix), limit)
+
+    def barangays(self, prefix="", town="", province="", limit=SUGGESTIONS):
+        """Barangay names of one town; the province is looked up when it is blank and unambiguous."""
+        if not town:
+            return []
+        if not province:
+            provinces = {p for t, p in self.towns(town, limit=SUGGESTIONS) if fold(t) == fold(town)}
+            if len(provinces) != 1:
+                return []
+            province = provinces.pop()
+        return [name for name, _ in self._search(_key(BARANGAY, province, town, prefix), limit)]
+
+_gazetteer = None
+
+def get_gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "build":
+        print("usage: python gazetteer.py build [gazetteer.csv] [gazetteer.dat]")
+        return 2
+    here = os.path.abspath(os.path.dirname(__file__))
+    source = argv[1] if len(argv) > 1 else os.path.join(here, "gazetteer.csv")
+    target = argv[2] if len(argv) > 2 else gazetteer_path()
+    count = build(source, target)
+    print(f"{count} places written to {target}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
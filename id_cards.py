@@ -0,0 +1,278 @@
+"""Batch ID-card rendering to a multi-page PDF or a folder of PNGs.
+
+    python id_cards.py student cards.pdf --course "Associate in Computer Technology" --workers 4
+    python id_cards.py employee cards/ --format png
+
+Cards are CR80 size (85.6 x 54 mm) at --dpi. Each worker process draws the
+template (band, logos, school name) once and then only the name, ID,
+course/year or department/position and emergency contact per card. Rows
+stream from the database in batches that are spread across the process
+pool; finished cards are written in order as they come back, ten to an A4
+page for the PDF, so memory stays flat however many cards are printed.
+
+PNG encoding happens in the workers, so --format png scales with them. The
+PDF writer itself is serial: workers send raw pixels rather than PNGs so
+the only work left in this process is embedding each card in the page.
+"""
+import os, re, sys, time, argparse
+import multiprocessing
+from collections import deque
+from PyQt5.QtCore import Qt, QBuffer, QByteArray, QIODevice, QRectF, QMarginsF
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QColor, QFont, QFontMetrics, QPdfWriter, QPageSize, QPageLayout
+from assets import resource_path
+from schema import KINDS
+
+CARD_MM = (85.6, 54.0)
+DPI = 300
+BATCH = 8  # cards per task sent to a worker
+IN_FLIGHT = 2  # batches queued per worker; raw cards are about 2 MB each at 300 dpi
+PAGE_COLUMNS, PAGE_ROWS = 2, 5  # cards per A4 page
+PAGE_MARGIN_MM = 10
+
+BAND_COLOR = QColor("#7a1f1f")
+TITLES = {"student": "STUDENT", "employee": "EMPLOYEE"}
+# Second line under the name: the two columns that say where someone belongs
+ROLE_COLUMNS = {"student": ("course", "year"), "employee": ("department", "position")}
+
+def card_size(dpi=DPI):
+    return tuple(round(mm / 25.4 * dpi) for mm in CARD_MM)
+
+def full_name(row):
+    name = f"{row.get('surname') or ''}, {row.get('first_name') or ''}"
+    for part in (row.get("mi"), row.get("extension")):
+        if part:
+            name += f" {part}"
+    return name.strip(", ")
+
+# --- Rendering ---
+class CardRenderer:
+    """Draws cards of one kind; the template is painted once and copied per card."""
+    def __init__(self, kind, dpi=DPI):
+        self.kind = kind
+        self.width, self.height = card_size(dpi)
+        self.unit = self.height / 100  # layout is in hundredths of the card height
+        self.id_column = KINDS[kind].id_column
+        self.template = self._template()
+
+    def _font(self, size, bold=False):
+        font = QFont("Arial")
+        font.setPixelSize(max(1, round(size * self.unit)))
+        font.setBold(bold)
+        return font
+
+    def _template(self):
+        u = self.unit
+        image = QImage(self.width, self.height, QImage.Format_RGB32)
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        band = QRectF(0, 0, self.width, 26 * u)
+        painter.fillRect(band, BAND_COLOR)
+        logo = round(22 * u)
+        for name, x in (("hcc-logo.png", 2 * u), ("mmd-logo.png", self.width - 2 * u - logo)):
+            source = QImage(resource_path(name))
+            if not source.isNull():
+                painter.drawImage(QRectF(x, 2 * u, logo, logo),
+                                  source.scaled(logo, logo, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        painter.setPen(Qt.white)
+        painter.setFont(self._font(8, bold=True))
+        painter.drawText(QRectF(0, 3 * u, self.width, 11 * u), Qt.AlignCenter, "HOLY CROSS COLLEGE")
+        painter.setFont(self._font(5))
+        painter.drawText(QRectF(0, 13 * u, self.width, 9 * u), Qt.AlignCenter, "Sta. Ana, Pampanga")
+        painter.fillRect(QRectF(0, 88 * u, self.width, 12 * u), BAND_COLOR)
+        painter.setFont(self._font(7, bold=True))
+        painter.drawText(QRectF(0, 88 * u, self.width, 12 * u), Qt.AlignCenter, TITLES[self.kind])
+        painter.end()
+        return image
+
+    def _line(self, painter, text, top, size, bold=False, color=Qt.black):
+        font = self._font(size, bold)
+        margin = 5 * self.unit
+        available = round(self.width - 2 * margin)
+        # Long names shrink to fit first (down to 60%); only then are they cut short
+        wide = QFontMetrics(font).horizontalAdvance(text)
+        if wide > available:
+            font = self._font(size * max(0.6, available / wide), bold)
+        text = QFontMetrics(font).elidedText(text, Qt.ElideRight, available)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QRectF(margin, top * self.unit, self.width - 2 * margin, (size + 3) * self.unit),
+                         Qt.AlignLeft | Qt.AlignVCenter, text)
+
+    def render(self, row):
+        """One card as a QImage; row is a dict of column values."""
+        image = self.template.copy()
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        self._line(painter, full_name(row), 30, 9, bold=True)
+        self._line(painter, str(row.get(self.id_column) or ""), 43, 8, bold=True, color=BAND_COLOR)
+        first, second = ROLE_COLUMNS[self.kind]
+        role = " - ".join(str(row[c]) for c in (first, second) if row.get(c))
+        self._line(painter, role, 55, 5.5)
+        self._line(painter, "In case of emergency:", 66, 4, color=QColor("#555555"))
+        relation = f" ({row['emergency_relation']})" if row.get("emergency_relation") else ""
+        self._line(painter, f"{row.get('emergency_name') or ''}{relation}  {row.get('emergency_contact') or ''}",
+                   73, 5)
+        painter.end()
+        return image
+
+def png_bytes(image):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+# --- Worker processes ---
+_app = None
+_renderer = None
+
+def _init_worker(kind, dpi):
+    """Runs once per worker: a headless Qt and the template."""
+    global _renderer, _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _app = QGuiApplication.instance() or QGuiApplication([])
+    _renderer = CardRenderer(kind, dpi)
+
+def raw_pixels(image):
+    """(RGB888 bytes, bytes per line): cheap to send back, unlike a QImage."""
+    image = image.convertToFormat(QImage.Format_RGB888)
+    return bytes(image.constBits().asstring(image.sizeInBytes())), image.bytesPerLine()
+
+def render_batch(rows, as_png=True):
+    """PNG bytes or raw_pixels() for each row, in order."""
+    encode = png_bytes if as_png else raw_pixels
+    return [encode(_renderer.render(row)) for row in rows]
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def render_cards(kind, rows, workers=None, dpi=DPI, as_png=True):
+    """Yield (row, card) in row order; card is PNG bytes, or a QImage with as_png=False.
+
+    workers=0 renders in this process. Otherwise at most IN_FLIGHT batches
+    per worker are queued, so rows are pulled from the source only as fast
+    as cards come back.
+    """
+    if workers == 0:
+        _init_worker(kind, dpi)
+        for row in rows:
+            image = _renderer.render(row)
+            yield row, png_bytes(image) if as_png else image
+        return
+    workers = workers or os.cpu_count() or 1
+    width, height = card_size(dpi)
+
+    def finished(in_flight):
+        batch, result = in_flight.popleft()
+        for row, card in zip(batch, result.get()):
+            if not as_png:
+                data, bytes_per_line = card
+                card = QImage(data, width, height, bytes_per_line, QImage.Format_RGB888)
+            yield row, card
+
+    # spawn: the same on Windows, and no Qt state is inherited through fork
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, initializer=_init_worker, initargs=(kind, dpi)) as pool:
+        in_flight = deque()
+        for batch in _batches(rows, BATCH):
+            in_flight.append((batch, pool.apply_async(render_batch, (batch, as_png))))
+            if len(in_flight) >= workers * IN_FLIGHT:
+                yield from finished(in_flight)
+        while in_flight:
+            yield from finished(in_flight)
+
+# --- Output ---
+def write_pdf(path, cards, dpi=DPI):
+    """Lay out (row, QImage) cards at true size, PAGE_COLUMNS x PAGE_ROWS per A4 page; returns the count."""
+    # Headless unless a GUI is already running: no display on the print server
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication.instance() or QGuiApplication([])
+    writer = QPdfWriter(path)
+    writer.setResolution(dpi)
+    writer.setPageLayout(QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Portrait, QMarginsF(0, 0, 0, 0)))
+    writer.setTitle("ID cards")
+    width, height = card_size(dpi)
+    margin = round(PAGE_MARGIN_MM / 25.4 * dpi)
+    gap = round(4 / 25.4 * dpi)
+    painter = QPainter(writer)
+    count = 0
+    try:
+        for count, (row, image) in enumerate(cards, 1):
+            slot = (count - 1) % (PAGE_COLUMNS * PAGE_ROWS)
+            if slot == 0 and count > 1:
+                writer.newPage()
+            column, line = slot % PAGE_COLUMNS, slot // PAGE_COLUMNS
+            painter.drawImage(QRectF(margin + column * (width + gap), margin + line * (height + gap),
+                                     width, height), image)
+    finally:
+        painter.end()
+    return count
+
+def write_pngs(directory, cards, id_column):
+    """One <id>.png per (row, PNG bytes) card in directory; returns the count."""
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for count, (row, data) in enumerate(cards, 1):
+        name = re.sub(r"[^\w.-]", "_", str(row.get(id_column) or count))
+        with open(os.path.join(directory, name + ".png"), "wb") as f:
+            f.write(data)
+    return count
+
+def database_rows(kind, **filters):
+    """Registered rows as dicts, streamed from an unbuffered cursor."""
+    from db_connector import pooled_connection
+    from exporter import build_query, stream_rows, export_columns
+    columns = export_columns(kind)
+    sql, params = build_query(kind, **filters)
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        for row in stream_rows(conn, sql, params):
+            yield dict(zip(columns, row))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render ID cards for registered students or employees.")
+    parser.add_argument("kind", choices=sorted(TITLES))
+    parser.add_argument("path", help="output .pdf, or a directory with --format png")
+    parser.add_argument("--format", choices=("pdf", "png"), help="default: from the path")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU, 0 = none)")
+    parser.add_argument("--dpi", type=int, default=DPI)
+    parser.add_argument("--course")
+    parser.add_argument("--year")
+    parser.add_argument("--department")
+    parser.add_argument("--since", help="registered on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="registered before this date (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from exporter import check_filters
+    try:
+        check_filters(args.kind, course=args.course, year=args.year, department=args.department)
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = args.format or ("pdf" if args.path.lower().endswith(".pdf") else "png")
+    rows = database_rows(args.kind, course=args.course, year=args.year, department=args.department,
+                         since=args.since, until=args.until)
+    start = time.perf_counter()
+    cards = render_cards(args.kind, rows, args.workers, args.dpi, as_png=output == "png")
+    if output == "pdf":
+        count = write_pdf(args.path, cards, args.dpi)
+    else:
+        count = write_pngs(args.path, cards, KINDS[args.kind].id_column)
+    elapsed = time.perf_counter() - start
+    print(f"{count} cards written to {args.path} in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:.0f} cards/sec)")
+    return 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
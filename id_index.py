@@ -0,0 +1,152 @@
+"""Local membership index of registered IDs for as-you-type duplicate warnings.
+
+A Bloom filter answers "definitely new" or "possibly taken" in a few
+microseconds; only a possible hit costs a database lookup. A filter for
+100k IDs, sized to grow to 200k at a 1% false-positive rate, is about 240 KB.
+"""
+import math, time, hashlib, threading
+from datetime import timedelta
+from db_connector import pooled_connection
+from registration import TABLES
+from exporter import stream_rows
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        new = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+class IdIndex:
+    """Bloom filter over one table's ID column, refreshed incrementally by registration time."""
+    # Re-read this far behind the last seen timestamp so late commits are not missed
+    REFRESH_OVERLAP = timedelta(minutes=5)
+
+    def __init__(self, kind, error_rate=0.01):
+        self.kind = kind
+        self.spec = TABLES[kind]
+        self.error_rate = error_rate
+        self._filter = None
+        self._latest = None
+
+    @property
+    def loaded(self):
+        return self._filter is not None
+
+    def might_contain(self, record_id):
+        """False means the ID is certainly free; True needs confirm()."""
+        bloom = self._filter
+        return bool(record_id) and bloom is not None and record_id in bloom
+
+    def add(self, record_id):
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(record_id)
+
+    def load(self):
+        """Build the filter from every ID in the table."""
+        spec = self.spec
+        with pooled_connection(user_role=self.kind) as conn:
+            if conn is None:
+                return False
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) AS n, MAX({}) AS latest FROM {}".format(
+                spec["date_column"], spec["table"]))
+            row = cursor.fetchone()
+            cursor.close()
+            # Room to double before the false-positive rate degrades
+            bloom = BloomFilter(max(row["n"] * 2, 10000), self.error_rate)
+            for (record_id,) in stream_rows(conn, "SELECT {} FROM {}".format(
+                    spec["id_column"], spec["table"]), ()):
+                bloom.add(record_id)
+        self._filter = bloom
+        self._latest = row["latest"]
+        return True
+
+    def refresh(self):
+        """Fold in IDs registered since the last load/refresh."""
+        bloom = self._filter
+        if bloom is None or bloom.count >= bloom.capacity:
+            return self.load()
+        spec = self.spec
+        sql = "SELECT {}, {} FROM {}".format(spec["id_column"], spec["date_column"], spec["table"])
+        params = ()
+        if self._latest is not None:
+            sql += " WHERE {} >= %s".format(spec["date_column"])
+            params = (self._latest - self.REFRESH_OVERLAP,)
+        with pooled_connection(user_role=self.kind) as conn:
+            if conn is None:
+                return False
+            latest = self._latest
+            for record_id, registered in stream_rows(conn, sql, params):
+                bloom.add(record_id)
+                if registered is not None and (latest is None or registered > latest):
+                    latest = registered
+        self._latest = latest
+        return True
+
+    def confirm(self, record_id):
+        """Ask the database whether record_id really exists."""
+        spec = self.spec
+        with pooled_connection(user_role=self.kind) as conn:
+            if conn is None:
+                return False
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM {} WHERE {} = %s LIMIT 1".format(
+                spec["table"], spec["id_column"]), (record_id,))
+            taken = cursor.fetchone() is not None
+            cursor.close()
+        if taken:
+            self.add(record_id)
+        return taken
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_refresher = None
+
+def get_index(kind):
+    with _indexes_lock:
+        index = _indexes.get(kind)
+        if index is None:
+            index = _indexes[kind] = IdIndex(kind)
+        return index
+
+def _refresh_forever(interval):
+    while True:
+        for kind in TABLES:
+            try:
+                get_index(kind).refresh()
+            except Exception as e:
+                print(f"Refreshing the {kind} ID index failed: {e}")
+        time.sleep(interval)
+
+def start_refresher(interval=60):
+    """Load every index in the background, then keep them current."""
+    global _refresher
+    with _indexes_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_forever, args=(interval,),
+                                          name="id-index-refresher", daemon=True)
+            _refresher.start()
@@ -0,0 +1,253 @@
+"""Command-line front end for the registration database; never imports PyQt5.
+
+    python -m iiscli import student students.xlsx --errors rejected.csv
+    python -m iiscli export student students.xlsx --course BSIT
+    python -m iiscli dedup student students.csv
+    python -m iiscli dedup employee EMP-001 EMP-002
+    python -m iiscli duplicates review.csv --workers 4
+    python -m iiscli validate student students.xlsx --errors rejected.csv
+    python -m iiscli search student --surname "DELA" --course "Associate in Computer Technology"
+    python -m iiscli migrate
+    python -m iiscli stats --today
+    python -m iiscli stats --rebuild
+    python -m iiscli offline --journal kiosk3/offline_queue.sqlite3
+"""
+import os, sys, csv, time, argparse
+from collections import Counter
+
+# --- import / export: thin wrappers over importer.main / exporter.main ---
+def cmd_import(args):
+    import importer
+    return importer.main(args.rest)
+
+def cmd_export(args):
+    import exporter
+    return exporter.main(args.rest)
+
+# --- dedup ---
+LOOKUP_CHUNK = 1000
+
+def _source_ids(kind, sources):
+    """(label, id) pairs from IDs given on the command line or from CSV/XLSX files."""
+    from registration import TABLES
+    id_field = TABLES[kind]["id_column"]
+    for source in sources:
+        if source.lower().endswith((".csv", ".xlsx", ".xlsm")):
+            from importer import iter_rows
+            for number, fields in iter_rows(source):
+                record_id = str(fields.get(id_field) or "").strip()
+                if record_id:
+                    yield f"{source}:{number}", record_id
+        else:
+            yield "argument", source.strip()
+
+def cmd_dedup(args):
+    from db_connector import pooled_connection
+    from registration import existing_ids
+
+    first_seen = {}
+    repeats = []
+    for where, record_id in _source_ids(args.kind, args.sources):
+        if record_id in first_seen:
+            repeats.append((where, record_id, first_seen[record_id]))
+        else:
+            first_seen[record_id] = where
+
+    ids = list(first_seen)
+    taken = set()
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            print("Failed to connect to the database.", file=sys.stderr)
+            return 2
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            taken |= existing_ids(conn, args.kind, ids[start:start + LOOKUP_CHUNK])
+
+    for where, record_id, first in repeats:
+        print(f"{where}: {record_id} repeats {first}")
+    for record_id in ids:
+        if record_id in taken:
+            print(f"{first_seen[record_id]}: {record_id} already registered")
+    print(f"{len(ids)} distinct IDs checked, {len(repeats)} repeated, {len(taken)} already registered")
+    return 1 if repeats or taken else 0
+
+# --- duplicates: the same person under different IDs or spellings, across both tables ---
+def cmd_duplicates(args):
+    from db_connector import pooled_connection
+    import person_match
+
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            print("Failed to connect to the database.", file=sys.stderr)
+            return 2
+        people, pairs, seconds = person_match.run(conn, args.report, args.threshold, args.workers)
+    print(f"{people} people checked in {seconds:.1f}s, {pairs} possible duplicates written to {args.report}")
+    return 1 if pairs else 0
+
+# --- validate: the whole file at once with pandas, nothing is written to the database ---
+def cmd_validate(args):
+    from registration import TABLES
+    from bulk_validation import read_frame, normalize_frame, validate_frame, error_messages, FIRST_ROW
+
+    frame = read_frame(args.path)
+    start = time.perf_counter()
+    frame = normalize_frame(args.kind, frame)
+    messages = error_messages(args.kind, validate_frame(args.kind, frame))
+    seconds = time.perf_counter() - start
+
+    ids = frame[TABLES[args.kind]["id_column"]]
+    rejected = [(index + FIRST_ROW, ids[index], message) for index, message in messages.items()]
+    if args.errors:
+        with open(args.errors, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "id", "error"])
+            writer.writerows(rejected)
+    else:
+        for number, record_id, message in rejected:
+            print(f"row {number} ({record_id or 'no ID'}): {message}", file=sys.stderr)
+    print(f"{len(frame)} rows checked in {seconds:.2f}s, {len(rejected)} rejected")
+    return 1 if rejected else 0
+
+# --- search / migrate ---
+def cmd_search(args):
+    from search import search
+    filters = {name: value for name, value in (("course", args.course), ("year", args.year),
+                                                ("department", args.department), ("position", args.position))
+               if value}
+    after = None
+    for _ in range(args.pages):
+        rows, after = search(args.kind, args.surname, args.first_name, after, args.limit, **filters)
+        for row in rows:
+            print("\t".join(str(row[column]) for column in ("id", f"{args.kind}_id", "surname", "first_name")))
+        if after is None:
+            break
+    return 0
+
+def cmd_migrate(args):
+    from db_connector import pooled_connection
+    from registration import TABLES
+    from search import ensure_indexes
+
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            print("Failed to connect to the database.", file=sys.stderr)
+            return 2
+        for kind in TABLES:
+            added = ensure_indexes(conn, kind)
+            print(f"{TABLES[kind]['table']}: " + (", ".join(added) if added else "up to date"))
+    return 0
+
+# --- stats: read from the counts table kept by enrollment_stats, never from the registrations ---
+def cmd_stats(args):
+    from datetime import date
+    from db_connector import pooled_connection
+    import enrollment_stats
+
+    kinds = (args.kind,) if args.kind else ("student", "employee")
+    since, until = args.since, args.until
+    if args.today:
+        since = until = date.today().isoformat()
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            print("Failed to connect to the database.", file=sys.stderr)
+            return 2
+        if args.rebuild:
+            for kind in kinds:
+                start = time.perf_counter()
+                enrollment_stats.rebuild(conn, kind)
+                print(f"{kind} counts rebuilt in {time.perf_counter() - start:.2f}s")
+        counts = {kind: enrollment_stats.read_counts(conn, kind, since, until) for kind in kinds}
+
+    for kind, cells in counts.items():
+        print(f"{kind}s: {sum(cells.values())}")
+        categories = Counter()
+        for (category, _), n in cells.items():
+            categories[category] += n
+        for category, total in sorted(categories.items()):
+            print(f"  {category or '(none)'}: {total}")
+            for (cell_category, subcategory), n in sorted(cells.items()):
+                if cell_category == category:
+                    print(f"    {subcategory or '(none)'}: {n}")
+    return 0
+
+# --- offline: what a kiosk's journal still holds, and what MySQL refused ---
+def cmd_offline(args):
+    from datetime import datetime
+    from offline_queue import OfflineQueue, journal_path
+
+    path = args.journal or journal_path()
+    if not os.path.exists(path):
+        print(f"No offline journal at {path}", file=sys.stderr)
+        return 2
+    queue = OfflineQueue(path)
+    counts = queue.counts()
+    conflicts = queue.conflicts()
+    print(f"{path}: {counts.get('pending', 0)} waiting to upload, {len(conflicts)} refused by the database")
+    for kind, record_id, error, queued_at in conflicts:
+        queued = datetime.fromtimestamp(queued_at).strftime("%Y-%m-%d %H:%M")
+        print(f"  {kind} {record_id} (saved offline {queued}): {error}")
+    return 1 if conflicts else 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="iiscli", description="IIS registration tools (no GUI).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sub = commands.add_parser("import", help="bulk import from CSV/XLSX (see importer.py)", add_help=False)
+    sub.add_argument("rest", nargs=argparse.REMAINDER)
+    sub.set_defaults(run=cmd_import)
+
+    sub = commands.add_parser("export", help="export to CSV/XLSX (see exporter.py)", add_help=False)
+    sub.add_argument("rest", nargs=argparse.REMAINDER)
+    sub.set_defaults(run=cmd_export)
+
+    sub = commands.add_parser("dedup", help="report repeated and already registered IDs")
+    sub.add_argument("kind", choices=("student", "employee"))
+    sub.add_argument("sources", nargs="+", help="IDs, or CSV/XLSX files with an ID column")
+    sub.set_defaults(run=cmd_dedup)
+
+    sub = commands.add_parser("duplicates", help="report people registered twice under different IDs or spellings")
+    sub.add_argument("report", help="ranked review report, .csv or .xlsx")
+    sub.add_argument("--threshold", type=float, default=0.85, help="lowest score reported (0-1)")
+    sub.add_argument("--workers", type=int, default=0, help="scoring processes (default: none)")
+    sub.set_defaults(run=cmd_duplicates)
+
+    sub = commands.add_parser("validate", help="check a CSV/XLSX file without importing it")
+    sub.add_argument("kind", choices=("student", "employee"))
+    sub.add_argument("path")
+    sub.add_argument("--errors", help="write rejected rows to this CSV file")
+    sub.set_defaults(run=cmd_validate)
+
+    sub = commands.add_parser("search", help="look people up by name prefix and filters")
+    sub.add_argument("kind", choices=("student", "employee"))
+    sub.add_argument("--surname")
+    sub.add_argument("--first-name")
+    sub.add_argument("--course")
+    sub.add_argument("--year")
+    sub.add_argument("--department")
+    sub.add_argument("--position")
+    sub.add_argument("--limit", type=int, default=50, help="rows per page")
+    sub.add_argument("--pages", type=int, default=1)
+    sub.set_defaults(run=cmd_search)
+
+    sub = commands.add_parser("migrate", help="add the search indexes a table is missing")
+    sub.set_defaults(run=cmd_migrate)
+
+    sub = commands.add_parser("stats", help="registration counts per course/year or department/position")
+    sub.add_argument("--kind", choices=("student", "employee"))
+    sub.add_argument("--since", help="registered on or after this day (YYYY-MM-DD)")
+    sub.add_argument("--until", help="registered on or before this day (YYYY-MM-DD)")
+    sub.add_argument("--today", action="store_true", help="only today's registrations")
+    sub.add_argument("--rebuild", action="store_true",
+                     help="recompute the counts from the registration tables first")
+    sub.set_defaults(run=cmd_stats)
+
+    sub = commands.add_parser("offline", help="list registrations a kiosk saved offline that the database refused")
+    sub.add_argument("--journal", help="offline_queue.sqlite3 to read (default: the one next to this program)")
+    sub.set_defaults(run=cmd_offline)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,18 @@
-import os, sys
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
-    QPushButton, QComboBox, QMessageBox, QToolButton
+    QPushButton, QComboBox, QMessageBox, QToolButton, QCompleter
 )
-from PyQt5.QtCore import Qt, QRegExp
-from PyQt5.QtGui import QRegExpValidator, QPixmap, QFont, QIcon
-from db_connector import connect_to_database
-
-def resource_path(relative_path):
-    """Get absolute path to resource, works for dev and for PyInstaller."""
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.abspath(os.path.dirname(__file__))
-    return os.path.join(base_path, relative_path)
+from PyQt5.QtCore import Qt, QRegExp, QObject, QRunnable, QThreadPool, QTimer, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QRegExpValidator, QFont, QIcon, QStandardItem, QStandardItemModel
+from functools import partial
+from registration import capitalize_words, validate_fields, record_values
+from schema import KINDS, NAME, ADDRESS, DETAILS, EMERGENCY
+import submission
+from db_connector import breaker
+import id_index
+from gazetteer import get_gazetteer
+import assets
+from assets import resource_path
 
 # --- Helper function to create a header container with no margins ---
 def create_header_container(logo_left_path, title_text, subtitle_text, dept_text, logo_right_path):
@@ -30,8 +29,7 @@ def create_header_container(logo_left_path, title_text, subtitle_text, dept_text
     
     # Left logo
     logo_left = QLabel()
-    pixmap_left = QPixmap(logo_left_path)
-    logo_left.setPixmap(pixmap_left)
+    logo_left.setPixmap(assets.pixmap(logo_left_path, assets.HEADER_LOGO_SIZE))
     logo_left.setStyleSheet("background: transparent;")
     logo_left.setScaledContents(True)
     logo_left.setFixedSize(100, 100)
@@ -68,8 +66,7 @@ def create_header_container(logo_left_path, title_text, subtitle_text, dept_text
     
     # Right logo
     logo_right = QLabel()
-    pixmap_right = QPixmap(logo_right_path)
-    logo_right.setPixmap(pixmap_right)
+    logo_right.setPixmap(assets.pixmap(logo_right_path, assets.HEADER_LOGO_SIZE))
     logo_right.setStyleSheet("background: transparent;")
     logo_right.setScaledContents(True)
     logo_right.setFixedSize(100, 100)
@@ -77,99 +74,119 @@ def create_header_container(logo_left_path, title_text, subtitle_text, dept_text
     
     return header_container
 
-# --- Base class for shared styling, common emergency section, and navigation ---
-class BaseInformationForm(QWidget):
-    def __init__(self, window_title, window_icon_path):
+# --- Database work, run off the GUI thread by SubmitWorker ---
+def save_registration(kind, label, values):
+    """Saves one row through the GUI-free core; returns (level, title, message) for the result box."""
+    try:
+        outcome = submission.save_record(kind, values)
+    except Exception as e:
+        return "critical", "Error", f"Registration failed: {e}"
+    if outcome == submission.SAVED:
+        return "information", "Success", "Registration successful!"
+    if outcome == submission.QUEUED:
+        return ("information", "Saved Offline",
+                "The database cannot be reached. The registration was saved on this computer "
+                "and will be uploaded automatically.")
+    if outcome == submission.DUPLICATE:
+        return "warning", "Duplicate Entry", f"This {label} ID already exists."
+    return "warning", "Duplicate Entry", "This ID is already waiting to be uploaded."
+
+class SubmitSignals(QObject):
+    # record id, QMessageBox level ("information"/"warning"/"critical"), title, message
+    finished = pyqtSignal(str, str, str, str)
+
+class SubmitWorker(QRunnable):
+    """Runs a save job on the global thread pool and reports back through signals."""
+    def __init__(self, record_id, job):
         super().__init__()
-        self.setWindowTitle(window_title)
-        self.setWindowIcon(QIcon(window_icon_path))
-        # The overall background for the form remains light blue
-        self.setStyleSheet("QWidget { background-color: #f0f8ff; font-size: 12pt; }")
-        self.font = QFont("Arial", 11)
-        self.enye_uppercase = True  # Initialize the toggle state for Ñ/ñ
-    
-    def go_back(self):
-        from first_page import Page  # Import here to avoid circular dependency
-        self.landing = Page()
-        self.landing.show()
-        self.close()
-        
-    def create_emergency_section(self, person_type="Student"):
-        emergency_title = QLabel("Emergency Contact")
-        emergency_title.setAlignment(Qt.AlignCenter)
-        emergency_title.setStyleSheet("font-weight: bold; font-size: 14pt; margin-top: 15px; margin-bottom: 10px;")
-        
-        emergency_form_layout = QFormLayout()
-        self.emergency_name_edit = QLineEdit()
-        emergency_form_layout.addRow("Name:", self.emergency_name_edit)
-        
-        self.emergency_relation_edit = QLineEdit()
-        emergency_form_layout.addRow("Relation to {}:".format(person_type), self.emergency_relation_edit)
-        
-        self.emergency_contact_edit = QLineEdit()
-        validator = QRegExpValidator(QRegExp(r"\d{0,11}"), self.emergency_contact_edit)
-        self.emergency_contact_edit.setValidator(validator)
-        self.emergency_contact_edit.setMaxLength(11)
-        emergency_form_layout.addRow("Contact Number:", self.emergency_contact_edit)
-        
-        return emergency_title, emergency_form_layout
+        self.record_id = record_id
+        self.job = job
+        self.signals = SubmitSignals()
 
-    def add_enye_button(self, layout):
-        """Adds an Ñ button to the top of the form."""
-        enye_button = QToolButton()
-        enye_button.setText("Ñ")
-        enye_button.setStyleSheet("font-size: 14pt; padding: 5px;")
-        enye_button.clicked.connect(self.insert_enye_character)
-        layout.addWidget(enye_button, alignment=Qt.AlignLeft)
+    def run(self):
+        try:
+            level, title, message = self.job()
+        except Exception as e:
+            level, title, message = "critical", "Error", f"Registration failed: {e}"
+        self.signals.finished.emit(self.record_id, level, title, message)
 
-    def insert_enye_character(self):
-        """Inserts the Ñ or ñ character into the currently focused field."""
-        focused_widget = QApplication.focusWidget()
-        if isinstance(focused_widget, QLineEdit):
-            cursor_position = focused_widget.cursorPosition()
-            current_text = focused_widget.text()
-            # Toggle between uppercase Ñ and lowercase ñ
-            if self.enye_uppercase:
-                new_text = current_text[:cursor_position] + "Ñ" + current_text[cursor_position:]
-            else:
-                new_text = current_text[:cursor_position] + "ñ" + current_text[cursor_position:]
-            focused_widget.setText(new_text)
-            focused_widget.setCursorPosition(cursor_position + 1)
-            # Toggle the state for the next click
-            self.enye_uppercase = not self.enye_uppercase
+class IdCheckSignals(QObject):
+    checked = pyqtSignal(str, bool)  # record id, whether it is already registered
 
-    def insert_uppercase_enye(self):
-        """Inserts the uppercase Ñ character into the currently focused field."""
-        focused_widget = QApplication.focusWidget()
-        if isinstance(focused_widget, QLineEdit):
-            cursor_position = focused_widget.cursorPosition()
-            current_text = focused_widget.text()
-            new_text = current_text[:cursor_position] + "Ñ" + current_text[cursor_position:]
-            focused_widget.setText(new_text)
-            focused_widget.setCursorPosition(cursor_position + 1)
+class IdCheckWorker(QRunnable):
+    """Confirms a possible duplicate ID against the database off the GUI thread."""
+    def __init__(self, index, record_id):
+        super().__init__()
+        self.index = index
+        self.record_id = record_id
+        self.signals = IdCheckSignals()
 
-    def insert_lowercase_enye(self):
-        """Inserts the lowercase ñ character into the currently focused field."""
-        focused_widget = QApplication.focusWidget()
-        if isinstance(focused_widget, QLineEdit):
-            cursor_position = focused_widget.cursorPosition()
-            current_text = focused_widget.text()
-            new_text = current_text[:cursor_position] + "ñ" + current_text[cursor_position:]
-            focused_widget.setText(new_text)
-            focused_widget.setCursorPosition(cursor_position + 1)
+    def run(self):
+        try:
+            taken = self.index.confirm(self.record_id)
+        except Exception:
+            taken = False
+        self.signals.checked.emit(self.record_id, taken)
+
+class BreakerSignals(QObject):
+    changed = pyqtSignal(str)  # db_connector.CircuitBreaker state
+
+_breaker_signals = None
+
+def breaker_signals():
+    """One signal source for every form; the breaker calls its listeners from worker threads."""
+    global _breaker_signals
+    if _breaker_signals is None:
+        _breaker_signals = BreakerSignals()
+        breaker.add_listener(_breaker_signals.changed.emit)
+    return _breaker_signals
+
+# Text and colours of the database status line, by breaker state; hidden while connected
+DB_STATUS = {
+    breaker.OPEN: ("Database unreachable — registrations are saved on this computer", "#a61b1b", "#fde8e8"),
+    breaker.HALF_OPEN: ("Reconnecting to the database…", "#8a5a00", "#fff4d6"),
+}
+
+# --- Rules applied while typing, by schema Field.case; contact digits are left to the validator ---
+def typed_initial(text):
+    """Middle initial as it is typed: one upper-case letter and a period."""
+    if not text:
+        return text
+    new_text = text.upper()
+    if not new_text.endswith("."):
+        new_text += "."
+    return new_text[:2]
+
+LIVE_CASES = {"upper": str.upper, "words": capitalize_words, "initial": typed_initial}
+
+# --- Base class: builds the whole form from schema.KINDS[KIND], plus navigation and submitting ---
+class BaseInformationForm(QWidget):
+    KIND = None  # "student" / "employee", a key of schema.KINDS
+    back_requested = pyqtSignal()
 
-# --- Student Information Form ---
-class StudentInformationForm(BaseInformationForm):
     def __init__(self):
-        super().__init__("Student Registration", resource_path("mmd-logo.png"))
-        self.setGeometry(275, 70, 800, 600)
-        self.showMaximized()
-        
+        super().__init__()
+        self.schema = KINDS[self.KIND]
+        self.setWindowTitle(f"{self.schema.label} Registration")
+        self.setWindowIcon(QIcon(assets.pixmap(resource_path("mmd-logo.png"))))
+        # The overall background for the form remains light blue
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setStyleSheet("QWidget { background-color: #f0f8ff; font-size: 12pt; }")
+        self.font = QFont("Arial", 11)
+        self.enye_uppercase = True  # Initialize the toggle state for Ñ/ñ
+        self._in_flight = {}  # record id -> SubmitSignals of submissions still running
+        self._id_checks = set()  # IdCheckSignals of lookups still running
+        self._id_taken = False
+        self.inputs = {}  # schema field name -> QLineEdit / QComboBox
+        self.build_layout()
+        self.record_id_edit = self.inputs[self.schema.id_column]
+        self.watch_record_id()
+        self.attach_address_completers()
+    
+    def build_layout(self):
         # Main layout for the window with no margins
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
-
-        
         
         # Add header container (full width, zero margins)
         header = create_header_container(
@@ -188,349 +205,89 @@ class StudentInformationForm(BaseInformationForm):
         form_container_layout.setSpacing(10)
         
         # Title for the form section
-        student_title = QLabel("Student Information")
-        student_title.setAlignment(Qt.AlignCenter)
-        student_title.setStyleSheet("font-weight: bold; font-size: 14pt; margin-bottom: 10px;")
-        form_container_layout.addWidget(student_title)
-        
-        # Name fields layout (Surname, First Name, MI, Extension)
-        name_layout = QHBoxLayout()
-        for label_text in ["Surname", "First Name", "MI.", "Ext."]:
-            sub_layout = QVBoxLayout()
-            line_edit = QLineEdit()
-            line_edit.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(line_edit)
-            label = QLabel(label_text)
-            label.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(label)
-            name_layout.addLayout(sub_layout)
-            if label_text == "Surname":
-                self.surname_edit = line_edit
-            elif label_text == "First Name":
-                self.first_name_edit = line_edit
-            elif label_text == "MI.":
-                self.mi_edit = line_edit
-            elif label_text == "Ext.":
-                self.extension_edit = line_edit
-        
-        self.surname_edit.textChanged.connect(self.onSurnameTextChanged)
-        self.first_name_edit.textChanged.connect(self.onFirstNameTextChanged)
-        self.mi_edit.textChanged.connect(self.onMITextChanged)
-        
+        form_title = QLabel(f"{self.schema.label} Information")
+        form_title.setAlignment(Qt.AlignCenter)
+        form_title.setStyleSheet("font-weight: bold; font-size: 14pt; margin-bottom: 10px;")
+        form_container_layout.addWidget(form_title)
+        
+        # Database status, shown only while the server is unreachable
+        self.db_status_label = QLabel()
+        self.db_status_label.setAlignment(Qt.AlignCenter)
+        form_container_layout.addWidget(self.db_status_label)
+        breaker_signals().changed.connect(self.show_db_status)
+        self.show_db_status(breaker.state)
+        
+        # Name fields (Surname, First Name, MI, Extension)
         name_form = QFormLayout()
-        name_form.addRow("Name:", name_layout)
+        name_form.addRow("Name:", self.create_field_row(NAME))
         form_container_layout.addLayout(name_form)
         
-        # Additional fields
+        # Address and the fields particular to this kind
         extra_form = QFormLayout()
-        address_layout = QHBoxLayout()
-        for field in ["Barangay", "Town/Municipality", "Province"]:
-            sub_layout = QVBoxLayout()
-            line_edit = QLineEdit()
-            line_edit.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(line_edit)
-            label = QLabel(field)
-            label.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(label)
-            address_layout.addLayout(sub_layout)
-            if field == "Barangay":
-                self.barangay_edit = line_edit
-            elif field == "Town/Municipality":
-                self.town_edit = line_edit
-            elif field == "Province":
-                self.province_edit = line_edit
-        extra_form.addRow("Address:", address_layout)
-        
-        self.student_id_edit = QLineEdit()
-        extra_form.addRow("Student ID:", self.student_id_edit)
-        
-        self.year_combo = QComboBox()
-        self.year_combo.addItems(["1st Year", "2nd Year", "3rd Year", "4th Year"])
-        extra_form.addRow("Year:", self.year_combo)
-        
-        self.course_combo = QComboBox()
-        self.course_combo.addItems([
-            "Bachelor of Science in Accountancy",
-            "Bachelor of Science in Accounting Information System",
-            "Bachelor of Science in Civil Engineering",
-            "Bachelor of Science in Computer Engineering",
-            "Bachelor of Science in Criminology",
-            "Bachelor of Science in Hospitality Management",
-            "Bachelor of Science in Tourism Management",
-            "Bachelor of Science in Information Technology",
-            "Bachelor of Science in Computer Science",
-            "Bachelor of Science in Psychology",
-            "Bachelor of Science in Business Administration - Major in Financial Management",
-            "Bachelor of Science in Business Administration - Major in Marketing Management",
-            "Bachelor of Science in Business Administration - Major in Human Resources Management",
-            "Bachelor of Science in Business Administration - Major in Operations Management",
-            "Bachelor of Elementary Education",
-            "Bachelor of Secondary Education - Major in English",
-            "Bachelor of Secondary Education - Major in Mathematics",
-            "Bachelor of Secondary Education - Major in Science",
-            "Bachelor of Secondary Education - Major in Filipino",
-            "Associate in Computer Technology"
-        ])
-        extra_form.addRow("Course:", self.course_combo)
+        extra_form.addRow("Address:", self.create_field_row(ADDRESS))
+        for field in self.schema.form_fields(DETAILS):
+            extra_form.addRow(f"{field.caption}:", self.create_input(field))
         form_container_layout.addLayout(extra_form)
         
         # Emergency contact section
-        em_title, em_layout = self.create_emergency_section("Student")
-        form_container_layout.addWidget(em_title)
-        form_container_layout.addLayout(em_layout)
+        emergency_title = QLabel("Emergency Contact")
+        emergency_title.setAlignment(Qt.AlignCenter)
+        emergency_title.setStyleSheet("font-weight: bold; font-size: 14pt; margin-top: 15px; margin-bottom: 10px;")
+        form_container_layout.addWidget(emergency_title)
+        emergency_form_layout = QFormLayout()
+        for field in self.schema.form_fields(EMERGENCY):
+            emergency_form_layout.addRow(f"{field.caption}:", self.create_input(field))
+        form_container_layout.addLayout(emergency_form_layout)
         
-        # Bottom buttons: Back, Submit, Ñ, and ñ
-        bottom_button_layout = QHBoxLayout()
-        bottom_button_layout.setContentsMargins(0, 0, 0, 0)
-        bottom_button_layout.setSpacing(10)
-
-        back_button = QPushButton("Back")
-        back_button.setStyleSheet("padding: 8px;")
-        back_button.clicked.connect(self.go_back)
-
-        submit_button = QPushButton("Submit Registration")
-        submit_button.setStyleSheet("""
-    QPushButton {
-        background-color: #28a745;  /* Green background */
-        color: white;              /* White text */
-        font-weight: bold;         /* Bold text */
-        padding: 8px;
-        border-radius: 5px;        /* Rounded corners */
-    }
-    QPushButton:hover {
-        background-color: #218838; /* Darker green on hover */
-    }
-    QPushButton:pressed {
-        background-color: #1e7e34; /* Even darker green when pressed */
-    }
-""")
-        submit_button.clicked.connect(self.submit_registration)
-
-        # Button for uppercase Ñ
-        uppercase_enye_button = QToolButton()
-        uppercase_enye_button.setText("Ñ")
-        uppercase_enye_button.setStyleSheet("font-size: 14pt; padding: 5px;")
-        uppercase_enye_button.clicked.connect(self.insert_uppercase_enye)
-
-        # Button for lowercase ñ
-        lowercase_enye_button = QToolButton()
-        lowercase_enye_button.setText("ñ")
-        lowercase_enye_button.setStyleSheet("font-size: 14pt; padding: 5px;")
-        lowercase_enye_button.clicked.connect(self.insert_lowercase_enye)
-
-        bottom_button_layout.addWidget(back_button, alignment=Qt.AlignLeft)
-        bottom_button_layout.addStretch(1)
-        bottom_button_layout.addWidget(uppercase_enye_button, alignment=Qt.AlignRight)
-        bottom_button_layout.addWidget(lowercase_enye_button, alignment=Qt.AlignRight)
-        bottom_button_layout.addWidget(submit_button, alignment=Qt.AlignRight)
-
-        form_container_layout.addLayout(bottom_button_layout)
+        form_container_layout.addLayout(self.create_button_row())
         
         main_layout.addWidget(form_container)
         self.setLayout(main_layout)
     
-    def onSurnameTextChanged(self, text):
-        new_text = text.upper()
-        if new_text != text:
-            self.surname_edit.blockSignals(True)
-            self.surname_edit.setText(new_text)
-            self.surname_edit.blockSignals(False)
-    
-    def onFirstNameTextChanged(self, text):
-        words = text.split(" ")
-        if words and words[-1] == "":
-            new_text = " ".join(word.capitalize() for word in words[:-1]) + " "
-        else:
-            new_text = " ".join(word.capitalize() for word in words)
-        if new_text != text:
-            self.first_name_edit.blockSignals(True)
-            self.first_name_edit.setText(new_text)
-            self.first_name_edit.blockSignals(False)
-    
-    def onMITextChanged(self, text):
-        if not text:
+    def show_db_status(self, state):
+        if state not in DB_STATUS:
+            self.db_status_label.hide()
             return
-        new_text = text.upper()
-        if not new_text.endswith("."):
-            new_text += "."
-        new_text = new_text[:2]
-        if new_text != text:
-            self.mi_edit.blockSignals(True)
-            self.mi_edit.setText(new_text)
-            self.mi_edit.blockSignals(False)
+        text, color, background = DB_STATUS[state]
+        self.db_status_label.setText(text)
+        self.db_status_label.setStyleSheet(
+            f"color: {color}; background-color: {background}; font-weight: bold; padding: 4px;")
+        self.db_status_label.show()
     
-    def submit_registration(self):
-        surname = self.surname_edit.text().strip()
-        first_name = self.first_name_edit.text().strip()
-        mi = self.mi_edit.text().strip()
-        extension = self.extension_edit.text().strip()
-        barangay = self.barangay_edit.text().strip()
-        town = self.town_edit.text().strip()
-        province = self.province_edit.text().strip()
-        address = f"{barangay}, {town}, {province}"
-        student_id = self.student_id_edit.text().strip()
-        year = self.year_combo.currentText()
-        course = self.course_combo.currentText()
-        emergency_name = self.emergency_name_edit.text().strip()
-        emergency_relation = self.emergency_relation_edit.text().strip()
-        emergency_contact = self.emergency_contact_edit.text().strip()
-        
-        required_fields = {
-            "Surname": surname,
-            "First Name": first_name,
-            "Middle Initial": mi,
-            "Student ID": student_id,
-            "Emergency Contact Name": emergency_name,
-            "Emergency Relation": emergency_relation,
-            "Emergency Contact Number": emergency_contact,
-        }
-        missing = [field for field, value in required_fields.items() if not value]
-        if missing:
-            QMessageBox.warning(self, "Input Error", 
-                "Please complete all required fields: " + ", ".join(missing))
-            return
-        
-        if len(emergency_contact) != 11:
-            QMessageBox.warning(self, "Input Error", 
-                "Emergency Contact Number must be exactly 11 digits.")
-            return
-        
-        conn = connect_to_database(user_role="student")
-        if conn is None:
-            QMessageBox.critical(self, "Database Error", "Failed to connect to the database.")
-            return
-        
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM students WHERE student_id = %s", (student_id,))
-        if cursor.fetchone():
-            QMessageBox.warning(self, "Duplicate Entry", "This Student ID already exists.")
-            conn.close()
-            return
-        
-        query = """
-            INSERT INTO students (student_id, surname, first_name, mi, extension, 
-                                    address, year, course, emergency_name, relation_to_student, emergency_contact)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        values = (student_id, surname, first_name, mi, extension, address, year, course,
-                  emergency_name, emergency_relation, emergency_contact)
-        try:
-            cursor.execute(query, values)
-            conn.commit()
-            QMessageBox.information(self, "Success", "Registration successful!")
-            self.clear_form()
-        except Exception as e:
-            conn.rollback()
-            QMessageBox.critical(self, "Error", f"Registration failed: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+    def create_input(self, field):
+        """Widget for one schema field, kept in self.inputs and as self.<name>_edit / _combo."""
+        if field.choices:
+            widget = QComboBox()
+            widget.addItems(field.choices)
+            setattr(self, f"{field.name}_combo", widget)
+        else:
+            widget = QLineEdit()
+            if field.max_length:
+                widget.setMaxLength(field.max_length)
+            if field.case == "digits":
+                digits = QRegExp(r"\d{0,%d}" % field.max_length if field.max_length else r"\d*")
+                widget.setValidator(QRegExpValidator(digits, widget))
+            elif field.case in LIVE_CASES:
+                widget.textChanged.connect(partial(self.apply_live_case, widget, LIVE_CASES[field.case]))
+            setattr(self, f"{field.name}_edit", widget)
+        self.inputs[field.name] = widget
+        return widget
     
-    def clear_form(self):
-        self.surname_edit.clear()
-        self.first_name_edit.clear()
-        self.mi_edit.clear()
-        self.extension_edit.clear()
-        self.barangay_edit.clear()
-        self.town_edit.clear()
-        self.province_edit.clear()
-        self.student_id_edit.clear()
-        self.year_combo.setCurrentIndex(0)
-        self.course_combo.setCurrentIndex(0)
-        self.emergency_name_edit.clear()
-        self.emergency_relation_edit.clear()
-        self.emergency_contact_edit.clear()
-
-
-# --- Employee Information Form (similar structure) ---
-class EmployeeInformationForm(BaseInformationForm):
-    def __init__(self):
-        super().__init__("Employee Registration", resource_path("mmd-logo.png"))
-        self.setGeometry(275, 70, 800, 600)
-        self.showMaximized()
-        
-        main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(0, 0, 0, 0)  # No margin for overall window
-
-        header = create_header_container(
-            resource_path("hcc-logo.png"),
-            "Holy Cross Colleges, Inc.",
-            "Sta. Lucia, Sta. Ana, Pampanga",
-            "Information Communication Department",
-            resource_path("mmd-logo.png")
-        )
-        main_layout.addWidget(header)
-        
-        form_container = QWidget()
-        form_container_layout = QVBoxLayout(form_container)
-        form_container_layout.setContentsMargins(10, 10, 10, 10)
-        form_container_layout.setSpacing(10)
-        
-        emp_title = QLabel("Employee Information")
-        emp_title.setAlignment(Qt.AlignCenter)
-        emp_title.setStyleSheet("font-weight: bold; font-size: 14pt; margin-bottom: 10px;")
-        form_container_layout.addWidget(emp_title)
-        
-        name_layout = QHBoxLayout()
-        for label_text in ["Surname", "First Name", "MI.", "Ext."]:
+    def create_field_row(self, section):
+        """Side-by-side inputs with their captions underneath, as used for the name and the address."""
+        row_layout = QHBoxLayout()
+        for field in self.schema.form_fields(section):
             sub_layout = QVBoxLayout()
-            line_edit = QLineEdit()
+            line_edit = self.create_input(field)
             line_edit.setAlignment(Qt.AlignCenter)
             sub_layout.addWidget(line_edit)
-            label = QLabel(label_text)
+            label = QLabel(field.caption)
             label.setAlignment(Qt.AlignCenter)
             sub_layout.addWidget(label)
-            name_layout.addLayout(sub_layout)
-            if label_text == "Surname":
-                self.surname_edit = line_edit
-            elif label_text == "First Name":
-                self.first_name_edit = line_edit
-            elif label_text == "MI.":
-                self.mi_edit = line_edit
-            elif label_text == "Ext.":
-                self.extension_edit = line_edit
-        
-        self.surname_edit.textChanged.connect(self.onSurnameTextChanged)
-        self.first_name_edit.textChanged.connect(self.onFirstNameTextChanged)
-        self.mi_edit.textChanged.connect(self.onMITextChanged)
-        
-        name_form = QFormLayout()
-        name_form.addRow("Name:", name_layout)
-        form_container_layout.addLayout(name_form)
-        
-        extra_form = QFormLayout()
-        address_layout = QHBoxLayout()
-        for field in ["Barangay", "Town/Municipality", "Province"]:
-            sub_layout = QVBoxLayout()
-            line_edit = QLineEdit()
-            line_edit.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(line_edit)
-            label = QLabel(field)
-            label.setAlignment(Qt.AlignCenter)
-            sub_layout.addWidget(label)
-            address_layout.addLayout(sub_layout)
-            if field == "Barangay":
-                self.barangay_edit = line_edit
-            elif field == "Town/Municipality":
-                self.town_edit = line_edit
-            elif field == "Province":
-                self.province_edit = line_edit
-        extra_form.addRow("Address:", address_layout)
-        
-        self.employee_id_edit = QLineEdit()
-        extra_form.addRow("Employee ID:", self.employee_id_edit)
-        
-        self.department_edit = QLineEdit()
-        extra_form.addRow("Department:", self.department_edit)
-        
-        self.position_edit = QLineEdit()
-        extra_form.addRow("Position:", self.position_edit)
-        form_container_layout.addLayout(extra_form)
-        
-        em_title, em_layout = self.create_emergency_section("Employee")
-        form_container_layout.addWidget(em_title)
-        form_container_layout.addLayout(em_layout)
-        
+            row_layout.addLayout(sub_layout)
+        return row_layout
+    
+    def create_button_row(self):
         # Bottom buttons: Back, Submit, Ñ, and ñ
         bottom_button_layout = QHBoxLayout()
         bottom_button_layout.setContentsMargins(0, 0, 0, 0)
@@ -540,8 +297,8 @@ class EmployeeInformationForm(BaseInformationForm):
         back_button.setStyleSheet("padding: 8px;")
         back_button.clicked.connect(self.go_back)
 
-        submit_button = QPushButton("Submit Registration")
-        submit_button.setStyleSheet("""
+        self.submit_button = QPushButton("Submit Registration")
+        self.submit_button.setStyleSheet("""
     QPushButton {
         background-color: #28a745;  /* Green background */
         color: white;              /* White text */
@@ -556,7 +313,7 @@ class EmployeeInformationForm(BaseInformationForm):
         background-color: #1e7e34; /* Even darker green when pressed */
     }
 """)
-        submit_button.clicked.connect(self.emp_submit)
+        self.submit_button.clicked.connect(self.submit_registration)
 
         # Button for uppercase Ñ
         uppercase_enye_button = QToolButton()
@@ -574,126 +331,213 @@ class EmployeeInformationForm(BaseInformationForm):
         bottom_button_layout.addStretch(1)
         bottom_button_layout.addWidget(uppercase_enye_button, alignment=Qt.AlignRight)
         bottom_button_layout.addWidget(lowercase_enye_button, alignment=Qt.AlignRight)
-        bottom_button_layout.addWidget(submit_button, alignment=Qt.AlignRight)
-
-        form_container_layout.addLayout(bottom_button_layout)
-        
-        main_layout.addWidget(form_container)
-        self.setLayout(main_layout)
+        bottom_button_layout.addWidget(self.submit_button, alignment=Qt.AlignRight)
+        return bottom_button_layout
     
-    def onSurnameTextChanged(self, text):
-        new_text = text.upper()
-        if new_text != text:
-            self.surname_edit.blockSignals(True)
-            self.surname_edit.setText(new_text)
-            self.surname_edit.blockSignals(False)
-    
-    def onFirstNameTextChanged(self, text):
-        words = text.split(" ")
-        if words and words[-1] == "":
-            new_text = " ".join(word.capitalize() for word in words[:-1]) + " "
-        else:
-            new_text = " ".join(word.capitalize() for word in words)
+    def apply_live_case(self, edit, rule, text):
+        new_text = rule(text)
         if new_text != text:
-            self.first_name_edit.blockSignals(True)
-            self.first_name_edit.setText(new_text)
-            self.first_name_edit.blockSignals(False)
+            edit.blockSignals(True)
+            edit.setText(new_text)
+            edit.blockSignals(False)
     
-    def onMITextChanged(self, text):
+    def attach_address_completers(self):
+        """Gazetteer suggestions under the address fields; picking a town fills in its province."""
+        self._address_completers = {}
+        for name in ("barangay", "town", "province"):
+            edit = self.inputs.get(name)
+            if edit is None:
+                continue
+            completer = QCompleter(QStandardItemModel(self), self)
+            # The gazetteer does the matching; the popup shows whatever it returned
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            completer.setWidget(edit)
+            completer.activated[QModelIndex].connect(partial(self.on_address_picked, name))
+            edit.textEdited.connect(partial(self.suggest_address, name))
+            self._address_completers[name] = completer
+
+    def suggest_address(self, name, text):
+        """Refills the suggestion popup of one address field; the gazetteer is opened on first use."""
+        completer = self._address_completers[name]
+        model = completer.model()
+        model.clear()
+        text = text.strip()
         if not text:
+            completer.popup().hide()
             return
-        new_text = text.upper()
-        if not new_text.endswith("."):
-            new_text += "."
-        new_text = new_text[:2]
-        if new_text != text:
-            self.mi_edit.blockSignals(True)
-            self.mi_edit.setText(new_text)
-            self.mi_edit.blockSignals(False)
-    
-    def emp_submit(self):
-        surname = self.surname_edit.text().strip()
-        first_name = self.first_name_edit.text().strip()
-        mi = self.mi_edit.text().strip()
-        extension = self.extension_edit.text().strip()
-        barangay = self.barangay_edit.text().strip()
-        town = self.town_edit.text().strip()
+        gazetteer = get_gazetteer()
         province = self.province_edit.text().strip()
-        address = f"{barangay}, {town}, {province}"
-        employee_id = self.employee_id_edit.text().strip()
-        department = self.department_edit.text().strip()
-        position = self.position_edit.text().strip()
-        emergency_name = self.emergency_name_edit.text().strip()
-        emergency_relation = self.emergency_relation_edit.text().strip()
-        emergency_contact = self.emergency_contact_edit.text().strip()
-        
-        required_fields = {
-            "Surname": surname,
-            "First Name": first_name,
-            "Middle Initial": self.mi_edit.text().strip(),
-            "Barangay": barangay,
-            "Town/Municipality": town,
-            "Province": province,
-            "Employee ID": employee_id,
-            "Department": department,
-            "Position": position,
-            "Emergency Contact Name": emergency_name,
-            "Emergency Relation": emergency_relation,
-            "Emergency Contact Number": emergency_contact,
-        }
-        missing = [field for field, value in required_fields.items() if not value]
-        if missing:
-            QMessageBox.warning(self, "Input Error",
-                "Please complete all required fields: " + ", ".join(missing))
-            return
-        
-        if len(emergency_contact) != 11:
-            QMessageBox.warning(self, "Input Error",
-                "Emergency Contact Number must be exactly 11 digits.")
-            return
-        
-        conn = connect_to_database(user_role="employee")
-        if conn is None:
-            QMessageBox.critical(self, "Database Error", "Failed to connect to the database.")
+        if name == "province":
+            suggestions = [(p, {}) for p in gazetteer.provinces(text)]
+        elif name == "town":
+            suggestions = [(t if province else f"{t}, {p}", {"town": t, "province": p})
+                           for t, p in gazetteer.towns(text, province)]
+        else:
+            town = self.town_edit.text().strip()
+            suggestions = [(b, {}) for b in gazetteer.barangays(text, town, province)]
+        for label, fill in suggestions:
+            item = QStandardItem(label)
+            item.setData(fill or {name: label}, Qt.UserRole)
+            model.appendRow(item)
+        if suggestions:
+            completer.complete()
+        else:
+            completer.popup().hide()
+
+    def on_address_picked(self, name, index):
+        for field, value in index.data(Qt.UserRole).items():
+            # A picked town only fills the province when none was typed yet
+            if field == name or not self.inputs[field].text().strip():
+                self.inputs[field].setText(value)
+
+    def go_back(self):
+        self.back_requested.emit()
+
+    def reset(self):
+        """Blank form for the next person; the window switches back here instead of rebuilding it."""
+        self.clear_form()
+        self._id_check_timer.stop()
+        self.show_id_taken(False)
+        
+    def collect_fields(self):
+        """Values as typed, keyed by schema field name."""
+        return {name: widget.currentText() if isinstance(widget, QComboBox) else widget.text().strip()
+                for name, widget in self.inputs.items()}
+
+    def clear_form(self):
+        for widget in self.inputs.values():
+            if isinstance(widget, QComboBox):
+                widget.setCurrentIndex(0)
+            else:
+                widget.clear()
+
+    def submit_registration(self):
+        record = self.collect_fields()
+        errors = validate_fields(self.KIND, record)
+        if errors:
+            QMessageBox.warning(self, "Input Error", errors[0])
             return
-        
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM employees WHERE employee_id = %s", (employee_id,))
-        if cursor.fetchone():
-            QMessageBox.warning(self, "Duplicate Entry", "This Employee ID already exists.")
-            conn.close()
+        values = record_values(self.KIND, record)
+        self.start_submit(values[0], values)
+
+    def start_submit(self, record_id, values):
+        """Hands the database work to the thread pool so the window stays responsive."""
+        if record_id in self._in_flight:
+            QMessageBox.information(self, "Please Wait", "This ID is already being submitted.")
             return
-        
-        query = """
-            INSERT INTO employees (employee_id, surname, first_name, mi, extension, 
-                                    address, department, position, emergency_name, emergency_relation, emergency_contact)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        values = (employee_id, surname, first_name, mi, extension, address, department, position,
-                  emergency_name, emergency_relation, emergency_contact)
-        try:
-            cursor.execute(query, values)
-            conn.commit()
-            QMessageBox.information(self, "Success", "Registration successful!")
+        worker = SubmitWorker(record_id, partial(save_registration, self.KIND, self.schema.label, values))
+        worker.signals.finished.connect(self.on_submit_finished)
+        self._in_flight[record_id] = worker.signals
+        self.set_busy(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def on_submit_finished(self, record_id, level, title, message):
+        self._in_flight.pop(record_id, None)
+        if not self._in_flight:
+            self.set_busy(False)
+        if level == "information":
+            self.id_index.add(record_id)
+        getattr(QMessageBox, level)(self, title, message)
+        # Only clear if the user has not moved on to another record meanwhile
+        if level == "information" and self.record_id_edit.text().strip() == record_id:
             self.clear_form()
-        except Exception as e:
-            conn.rollback()
-            QMessageBox.critical(self, "Error", f"Registration failed: {e}")
-        finally:
-            cursor.close()
-            conn.close()
-    
-    def clear_form(self):
-        self.surname_edit.clear()
-        self.first_name_edit.clear()
-        self.mi_edit.clear()
-        self.extension_edit.clear()
-        self.barangay_edit.clear()
-        self.town_edit.clear()
-        self.province_edit.clear()
-        self.employee_id_edit.clear()
-        self.department_edit.clear()
-        self.position_edit.clear()
-        self.emergency_name_edit.clear()
-        self.emergency_relation_edit.clear()
-        self.emergency_contact_edit.clear()
\ No newline at end of file
+
+    def watch_record_id(self):
+        """Flags an already registered ID while it is being typed."""
+        self.id_index = id_index.get_index(self.KIND)
+        # Only ask the database once typing pauses on a possible hit
+        self._id_check_timer = QTimer(self)
+        self._id_check_timer.setSingleShot(True)
+        self._id_check_timer.setInterval(250)
+        self._id_check_timer.timeout.connect(self.confirm_record_id)
+        self.record_id_edit.textChanged.connect(self.on_record_id_changed)
+
+    def on_record_id_changed(self, text):
+        self.show_id_taken(False)
+        if self.id_index.might_contain(text.strip()):
+            self._id_check_timer.start()
+        else:
+            self._id_check_timer.stop()
+
+    def confirm_record_id(self):
+        worker = IdCheckWorker(self.id_index, self.record_id_edit.text().strip())
+        worker.signals.checked.connect(self.on_record_id_checked)
+        self._id_checks.add(worker.signals)
+        QThreadPool.globalInstance().start(worker)
+
+    def on_record_id_checked(self, record_id, taken):
+        self._id_checks.discard(self.sender())
+        if record_id == self.record_id_edit.text().strip():
+            self.show_id_taken(taken)
+
+    def show_id_taken(self, taken):
+        if taken == self._id_taken:
+            return
+        self._id_taken = taken
+        if taken:
+            self.record_id_edit.setStyleSheet("border: 2px solid #dc3545;")
+            self.record_id_edit.setToolTip(f"This {self.schema.label} ID already exists.")
+        else:
+            self.record_id_edit.setStyleSheet("")
+            self.record_id_edit.setToolTip("")
+
+    def set_busy(self, busy):
+        # Disabled while saving so a double click cannot start a second submit
+        self.submit_button.setEnabled(not busy)
+        self.submit_button.setText("Submitting..." if busy else "Submit Registration")
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+
+    def add_enye_button(self, layout):
+        """Adds an Ñ button to the top of the form."""
+        enye_button = QToolButton()
+        enye_button.setText("Ñ")
+        enye_button.setStyleSheet("font-size: 14pt; padding: 5px;")
+        enye_button.clicked.connect(self.insert_enye_character)
+        layout.addWidget(enye_button, alignment=Qt.AlignLeft)
+
+    def insert_enye_character(self):
+        """Inserts the Ñ or ñ character into the currently focused field."""
+        focused_widget = QApplication.focusWidget()
+        if isinstance(focused_widget, QLineEdit):
+            cursor_position = focused_widget.cursorPosition()
+            current_text = focused_widget.text()
+            # Toggle between uppercase Ñ and lowercase ñ
+            if self.enye_uppercase:
+                new_text = current_text[:cursor_position] + "Ñ" + current_text[cursor_position:]
+            else:
+                new_text = current_text[:cursor_position] + "ñ" + current_text[cursor_position:]
+            focused_widget.setText(new_text)
+            focused_widget.setCursorPosition(cursor_position + 1)
+            # Toggle the state for the next click
+            self.enye_uppercase = not self.enye_uppercase
+
+    def insert_uppercase_enye(self):
+        """Inserts the uppercase Ñ character into the currently focused field."""
+        focused_widget = QApplication.focusWidget()
+        if isinstance(focused_widget, QLineEdit):
+            cursor_position = focused_widget.cursorPosition()
+            current_text = focused_widget.text()
+            new_text = current_text[:cursor_position] + "Ñ" + current_text[cursor_position:]
+            focused_widget.setText(new_text)
+            focused_widget.setCursorPosition(cursor_position + 1)
+
+    def insert_lowercase_enye(self):
+        """Inserts the lowercase ñ character into the currently focused field."""
+        focused_widget = QApplication.focusWidget()
+        if isinstance(focused_widget, QLineEdit):
+            cursor_position = focused_widget.cursorPosition()
+            current_text = focused_widget.text()
+            new_text = current_text[:cursor_position] + "ñ" + current_text[cursor_position:]
+            focused_widget.setText(new_text)
+            focused_widget.setCursorPosition(cursor_position + 1)
+
+# --- Student Information Form ---
+class StudentInformationForm(BaseInformationForm):
+    KIND = "student"
+
+# --- Employee Information Form ---
+class EmployeeInformationForm(BaseInformationForm):
+    KIND = "employee"
@@ -0,0 +1,140 @@
+"""Bulk registration import from CSV or XLSX.
+
+Rows are streamed (csv reader / openpyxl read-only mode) and inserted in
+chunks, so the spreadsheet is never held in memory as a whole:
+
+    python importer.py student students.xlsx --chunk-size 500 --errors rejected.csv
+"""
+import sys, csv, time, argparse
+from db_connector import pooled_connection
+from registration import (
+    TABLES, normalize_fields, validate_fields, record_values, insert_records, DuplicateRecordError,
+    ROW_ERRORS, refusal_message
+)
+
+# Spreadsheet headers as the registrar writes them -> record field names
+HEADER_ALIASES = {
+    "mi.": "mi", "middle_initial": "mi", "ext.": "extension", "ext": "extension",
+    "town/municipality": "town", "municipality": "town",
+    "relation": "emergency_relation", "relation_to_student": "emergency_relation",
+    "relation_to_employee": "emergency_relation",
+    "contact_number": "emergency_contact", "emergency_contact_number": "emergency_contact",
+    "emergency_contact_name": "emergency_name",
+}
+
+def field_name(header):
+    key = str(header or "").strip().lower()
+    key = HEADER_ALIASES.get(key, key)
+    key = "_".join(key.replace("/", " ").split())
+    return HEADER_ALIASES.get(key, key)
+
+def iter_rows(path):
+    """Yield (row_number, dict) pairs from a CSV or XLSX file without loading all of it."""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [field_name(h) for h in next(rows, ())]
+            for number, row in enumerate(rows, start=2):
+                if any(value not in (None, "") for value in row):
+                    yield number, dict(zip(header, row))
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [field_name(h) for h in next(reader, [])]
+            for number, row in enumerate(reader, start=2):
+                if any(value.strip() for value in row):
+                    yield number, dict(zip(header, row))
+
+def import_file(kind, path, chunk_size=500, on_error=None):
+    """Normalize, validate and insert every row of path; returns a summary dict.
+
+    on_error(row_number, record_id, message) is called for each rejected row.
+    A chunk that hits a duplicate, or a row the database refuses (a value
+    too long for its column, another constraint), is retried row by row so
+    only the offending rows are rejected and the import carries on.
+    """
+    id_field = TABLES[kind]["id_column"]
+    report = on_error or (lambda number, record_id, message: None)
+    summary = {"rows": 0, "inserted": 0, "rejected": 0, "seconds": 0.0}
+    seen = {}
+    chunk = []
+    start = time.perf_counter()
+
+    def reject(number, record_id, message):
+        summary["rejected"] += 1
+        report(number, record_id, message)
+
+    def flush(conn):
+        try:
+            insert_records(conn, kind, [values for _, values in chunk])
+            summary["inserted"] += len(chunk)
+        except ROW_ERRORS:
+            for number, values in chunk:
+                try:
+                    insert_records(conn, kind, [values])
+                    summary["inserted"] += 1
+                except DuplicateRecordError:
+                    reject(number, values[0], "ID already exists in the database")
+                except ROW_ERRORS as e:
+                    reject(number, values[0], refusal_message(e))
+        chunk.clear()
+
+    with pooled_connection(user_role=kind) as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        for number, fields in iter_rows(path):
+            summary["rows"] += 1
+            record = normalize_fields(kind, fields)
+            record_id = record.get(id_field, "")
+            errors = validate_fields(kind, record)
+            if errors:
+                reject(number, record_id, " ".join(errors))
+                continue
+            if record_id in seen:
+                reject(number, record_id, f"Duplicate ID in file (first seen on row {seen[record_id]})")
+                continue
+            seen[record_id] = number
+            chunk.append((number, record_values(kind, record)))
+            if len(chunk) >= chunk_size:
+                flush(conn)
+        if chunk:
+            flush(conn)
+
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import student or employee registrations from CSV/XLSX.")
+    parser.add_argument("kind", choices=sorted(TABLES))
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--errors", help="write rejected rows to this CSV file")
+    args = parser.parse_args(argv)
+
+    error_file = open(args.errors, "w", newline="", encoding="utf-8") if args.errors else None
+    error_writer = csv.writer(error_file) if error_file else None
+    if error_writer:
+        error_writer.writerow(["row", "id", "error"])
+
+    def on_error(number, record_id, message):
+        if error_writer:
+            error_writer.writerow([number, record_id, message])
+        else:
+            print(f"row {number} ({record_id or 'no ID'}): {message}", file=sys.stderr)
+
+    try:
+        summary = import_file(args.kind, args.path, args.chunk_size, on_error)
+    finally:
+        if error_file:
+            error_file.close()
+    rate = summary["rows"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(f"{summary['rows']} rows read, {summary['inserted']} inserted, {summary['rejected']} rejected "
+          f"in {summary['seconds']:.2f}s ({rate:.0f} rows/sec)")
+    return 0 if not summary["rejected"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
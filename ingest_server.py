@@ -0,0 +1,241 @@
+"""Ingestion daemon: kiosks hand registrations to it instead of opening MySQL connections.
+
+    python ingest_server.py --host 0.0.0.0 --port 8765 --connections 2 --window-ms 20
+
+Kiosks find it through IIS_INGEST_ADDR=host:port (see submission.save_record).
+The protocol is one JSON object per line in each direction, answered by id,
+so a kiosk may have several records in flight on one socket:
+
+    -> {"id": 1, "kind": "student", "values": ["2025-0001", "DELA CRUZ", ...]}
+    <- {"id": 1, "status": "saved"}
+
+status is "saved", "duplicate", "unavailable" (no database connection; the
+kiosk keeps the record in its offline journal) or "error" with a message.
+
+Records that arrive within window_ms of each other, up to max_batch, go to
+MySQL as one multi-row INSERT and one commit over a few long-lived
+connections, so a dozen kiosks cost a handful of commits a second instead of
+a connection and a commit each. Only this process needs database
+credentials. Keep Qt out of this module.
+"""
+import sys, json, asyncio, argparse
+from concurrent.futures import ThreadPoolExecutor
+import pymysql
+from db_connector import ConnectionPool
+from registration import TABLES, insert_records, existing_ids, DuplicateRecordError, ROW_ERRORS, refusal_message
+
+DEFAULT_PORT = 8765
+
+SAVED = "saved"
+DUPLICATE = "duplicate"
+UNAVAILABLE = "unavailable"
+ERROR = "error"
+
+# --- Batch insert, run on the executor threads ---
+def _insert_row_by_row(conn, kind, rows, indexes, statuses):
+    for i in indexes:
+        try:
+            insert_records(conn, kind, [rows[i]])
+            statuses[i] = SAVED
+        except DuplicateRecordError:
+            statuses[i] = DUPLICATE
+        except ROW_ERRORS as e:
+            statuses[i] = (ERROR, refusal_message(e))
+
+def insert_batch(pool, kind, rows):
+    """Insert rows (value sequences) with as few commits as possible; one status per row.
+
+    Like offline_queue.replay: the whole batch goes up in one statement, and
+    only if that hits a duplicate are the clashing IDs looked up and the rest
+    inserted again, row by row as a last resort. Any other row-level error
+    goes straight to row by row, so only the record at fault gets "error"
+    (with its own message) and the rest of the window is still saved.
+    """
+    statuses = [None] * len(rows)
+    # The same ID twice in one window: the first one wins
+    first = {}
+    for i, values in enumerate(rows):
+        if values[0] in first:
+            statuses[i] = DUPLICATE
+        else:
+            first[values[0]] = i
+    fresh = list(first.values())
+
+    conn = pool.acquire()
+    if conn is None:
+        return [status or UNAVAILABLE for status in statuses]
+    discard = False
+    try:
+        try:
+            insert_records(conn, kind, [rows[i] for i in fresh])
+        except DuplicateRecordError:
+            taken = existing_ids(conn, kind, [rows[i][0] for i in fresh])
+            for i in fresh:
+                if rows[i][0] in taken:
+                    statuses[i] = DUPLICATE
+            fresh = [i for i in fresh if statuses[i] is None]
+            if fresh:
+                try:
+                    insert_records(conn, kind, [rows[i] for i in fresh])
+                except ROW_ERRORS:
+                    # A direct writer got in between the lookup and the insert, or a row is bad
+                    _insert_row_by_row(conn, kind, rows, fresh, statuses)
+        except ROW_ERRORS:
+            _insert_row_by_row(conn, kind, rows, fresh, statuses)
+        for i in fresh:
+            if statuses[i] is None:
+                statuses[i] = SAVED
+    except pymysql.err.OperationalError:
+        discard = True
+        raise
+    finally:
+        pool.release(conn, discard=discard)
+    return statuses
+
+# --- Group commit ---
+class GroupCommitter:
+    """Collects records of one kind into batches; one batch per connection is in flight at a time."""
+    def __init__(self, kind, pool, executor, window=0.02, max_batch=200):
+        self.kind = kind
+        self.pool = pool
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.records = 0
+
+    async def submit(self, values):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((values, future))
+        return await future
+
+    async def _next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            try:
+                statuses = await loop.run_in_executor(
+                    self.executor, insert_batch, self.pool, self.kind, [values for values, _ in batch])
+            except Exception as e:
+                print(f"Inserting {len(batch)} {self.kind} records failed: {e}")
+                statuses = [(ERROR, str(e))] * len(batch)
+            self.batches += 1
+            self.records += len(batch)
+            for (_, future), status in zip(batch, statuses):
+                if not future.done():
+                    future.set_result(status)
+
+class IngestServer:
+    """Accepts kiosk connections and feeds their records to one GroupCommitter per kind.
+
+    pool defaults to a ConnectionPool of the given size per kind; the
+    benchmarks pass a stand-in with the same acquire/release interface.
+    """
+    def __init__(self, connections=2, window=0.02, max_batch=200, pool=None):
+        self.connections = connections
+        self.executor = ThreadPoolExecutor(max_workers=connections * len(TABLES),
+                                           thread_name_prefix="ingest")
+        self.committers = {
+            kind: GroupCommitter(kind, pool or ConnectionPool(kind, max_size=connections, idle_timeout=3600),
+                                 self.executor, window, max_batch)
+            for kind in TABLES
+        }
+
+    async def handle_record(self, message, writer, write_lock):
+        reply = {"id": message.get("id")}
+        kind, values = message.get("kind"), message.get("values")
+        if kind not in self.committers:
+            status = (ERROR, f"Unknown kind: {kind}")
+        elif not isinstance(values, list) or len(values) != len(TABLES[kind]["columns"]) or not values[0]:
+            status = (ERROR, f"Expected {len(TABLES[kind]['columns'])} values with the ID first")
+        else:
+            status = await self.committers[kind].submit(values)
+        if isinstance(status, tuple):
+            status, reply["message"] = status
+        reply["status"] = status
+        async with write_lock:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+
+    async def handle_kiosk(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = {}
+                if not isinstance(message, dict):
+                    message = {}
+                task = asyncio.ensure_future(self.handle_record(message, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening and committing; returns the asyncio server."""
+        for committer in self.committers.values():
+            for _ in range(self.connections):
+                asyncio.ensure_future(committer.run())
+        return await asyncio.start_server(self.handle_kiosk, host, port)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        print(f"Ingesting on {', '.join(str(s.getsockname()[:2]) for s in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for committer in self.committers.values():
+            print(f"{committer.kind}: {committer.records} records in {committer.batches} commits")
+            if isinstance(committer.pool, ConnectionPool):
+                committer.pool.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Group-commit registrations from the kiosks.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (0.0.0.0 for every interface)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=2, help="MySQL connections per kind")
+    parser.add_argument("--window-ms", type=float, default=20, help="how long a batch waits for more records")
+    parser.add_argument("--max-batch", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    server = IngestServer(args.connections, args.window_ms / 1000, args.max_batch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import os, sys, json, time, sqlite3, threading
+from contextlib import contextmanager
+from db_connector import pooled_connection, breaker
+from registration import TABLES, insert_records, existing_ids, DuplicateRecordError, ROW_ERRORS, refusal_message
+
+def journal_path():
+    """The journal lives next to the executable (or this file when run from source)."""
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(os.path.dirname(__file__))
+    return os.path.join(base_path, "offline_queue.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    queued_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS journal_pending_id
+    ON journal (kind, record_id) WHERE status = 'pending';
+"""
+
+# --- Durable local journal ---
+class OfflineQueue:
+    """Registrations accepted while MySQL is unreachable, kept in a local SQLite file.
+
+    Rows are replayed in the order they were queued. A record ID can only be
+    pending once per kind; rows MySQL rejects stay in the journal as conflicts.
+    """
+    def __init__(self, path=None):
+        self.path = path or journal_path()
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # sqlite3's own context manager only commits; close the handle as well
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            db.execute("PRAGMA synchronous=FULL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def enqueue(self, kind, values):
+        """Queue one row; returns False if that ID is already waiting to be uploaded."""
+        with self._lock, self._connect() as db:
+            try:
+                db.execute("INSERT INTO journal (kind, record_id, payload, queued_at) VALUES (?, ?, ?, ?)",
+                           (kind, values[0], json.dumps(list(values)), time.time()))
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def has_pending(self, kind):
+        with self._connect() as db:
+            row = db.execute("SELECT 1 FROM journal WHERE kind = ? AND status = 'pending' LIMIT 1",
+                             (kind,)).fetchone()
+        return row is not None
+
+    def pending(self, kind, limit):
+        with self._connect() as db:
+            rows = db.execute("SELECT seq, payload FROM journal WHERE kind = ? AND status = 'pending' "
+                              "ORDER BY seq LIMIT ?", (kind, limit)).fetchall()
+        return [(seq, tuple(json.loads(payload))) for seq, payload in rows]
+
+    def mark_done(self, seqs):
+        with self._lock, self._connect() as db:
+            db.executemany("DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def mark_conflict(self, seq, error):
+        with self._lock, self._connect() as db:
+            db.execute("UPDATE journal SET status = 'conflict', error = ? WHERE seq = ?", (error, seq))
+
+    def counts(self):
+        """{status: rows} for the journal, e.g. {"pending": 3, "conflict": 1}."""
+        with self._connect() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM journal GROUP BY status").fetchall())
+
+    def conflicts(self):
+        """(kind, record_id, error, queued_at) for every row MySQL refused."""
+        with self._connect() as db:
+            return db.execute("SELECT kind, record_id, error, queued_at FROM journal "
+                              "WHERE status = 'conflict' ORDER BY seq").fetchall()
+
+    def replay(self, kind, batch_size=500):
+        """Push one batch of pending rows to MySQL; returns how many left the pending state.
+
+        The whole batch goes up as one multi-row INSERT. Only if that hits a
+        duplicate are the clashing IDs looked up, recorded as conflicts, and
+        the remainder inserted again. A row refused for any other reason (a
+        value too long for its column, another constraint) is found by
+        inserting row by row and recorded as a conflict too, so one bad row
+        never holds up the rest of the journal.
+        """
+        rows = self.pending(kind, batch_size)
+        if not rows:
+            return 0
+        with pooled_connection(user_role=kind) as conn:
+            if conn is None:
+                return 0
+            try:
+                insert_records(conn, kind, [values for _, values in rows])
+            except DuplicateRecordError:
+                self._replay_around_duplicates(kind, conn, rows)
+            except ROW_ERRORS:
+                self._replay_row_by_row(kind, conn, rows)
+            else:
+                self.mark_done([seq for seq, _ in rows])
+        return len(rows)
+
+    def _replay_around_duplicates(self, kind, conn, rows):
+        existing = existing_ids(conn, kind, [values[0] for _, values in rows])
+        fresh = []
+        for seq, values in rows:
+            if values[0] in existing:
+                self._report_conflict(kind, seq, values[0], "ID already exists in the database")
+            else:
+                fresh.append((seq, values))
+        if not fresh:
+            return
+        try:
+            insert_records(conn, kind, [values for _, values in fresh])
+            self.mark_done([seq for seq, _ in fresh])
+        except ROW_ERRORS:
+            # Another kiosk got in between the lookup and the insert, or a row is bad in another way
+            self._replay_row_by_row(kind, conn, fresh)
+
+    def _replay_row_by_row(self, kind, conn, rows):
+        uploaded = []
+        for seq, values in rows:
+            try:
+                insert_records(conn, kind, [values])
+                uploaded.append(seq)
+            except ROW_ERRORS as e:
+                self._report_conflict(kind, seq, values[0], refusal_message(e))
+        self.mark_done(uploaded)
+
+    def _report_conflict(self, kind, seq, record_id, error):
+        self.mark_conflict(seq, error)
+        print(f"Offline {kind} record {record_id} was not uploaded: {error}")
+
+# --- Background replayer ---
+class Replayer(threading.Thread):
+    """Periodically drains the journal into MySQL once the server answers again."""
+    def __init__(self, queue, interval=15, batch_size=500):
+        super().__init__(name="offline-replayer", daemon=True)
+        self.queue = queue
+        self.interval = interval
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            for kind in TABLES:
+                try:
+                    while self.queue.replay(kind, self.batch_size) == self.batch_size:
+                        pass
+                except Exception as e:
+                    print(f"Offline replay of {kind} records failed: {e}")
+
+_queue = None
+_replayer = None
+_init_lock = threading.Lock()
+
+def get_queue():
+    global _queue
+    with _init_lock:
+        if _queue is None:
+            _queue = OfflineQueue()
+        return _queue
+
+def start_replayer(interval=15):
+    global _replayer
+    queue = get_queue()
+    with _init_lock:
+        if _replayer is None:
+            _replayer = Replayer(queue, interval=interval)
+            _replayer.start()
+            # Upload as soon as the server is back rather than at the next interval
+            breaker.add_listener(lambda state: state == breaker.CLOSED and _replayer.wake())
+        return _replayer
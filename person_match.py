@@ -0,0 +1,259 @@
+"""Find people registered twice, under different IDs or spellings, across students and employees.
+
+    python -m iiscli duplicates review.csv --workers 4
+
+Records are only compared inside blocks that share a key, never all pairs:
+
+    name     phonetic codes of surname and first name, sorted (so swapped
+             fields still meet); "DE LA CRUZ", "Dela Cruz" and "DELA CRUZ"
+             all code the same, as do Ñ and N
+    contact  the emergency contact number
+
+Blocks too big to compare in full (a common surname, a placeholder contact
+number) are sorted by name and only neighbours within WINDOW are compared.
+Each candidate pair is scored on name, middle initial, address and
+emergency contact; pairs at or above the threshold go to a review report,
+best first. Nothing is changed in the database. Keep Qt out of this module.
+"""
+import time, multiprocessing
+from functools import lru_cache
+from collections import namedtuple, defaultdict
+from registration import TABLES, clean_text, normalize_contact
+from gazetteer import fold
+
+MAX_BLOCK = 500  # compared in full up to this size
+WINDOW = 30  # neighbours compared in a larger block
+THRESHOLD = 0.85
+CHUNK_PAIRS = 200000  # about this many comparisons per task sent to a worker
+
+WEIGHTS = {"surname": 0.30, "first_name": 0.25, "mi": 0.10, "address": 0.15,
+           "contact": 0.12, "emergency_name": 0.08}
+
+# name is as registered, for the report; the rest are folded, address as a set of its words
+Person = namedtuple("Person", "kind record_id name surname first_name mi address emergency_name contact")
+
+def person(kind, row):
+    """Person from a dict of column values."""
+    given = " ".join(clean_text(row.get(column)) for column in ("first_name", "mi", "extension"))
+    name = f"{clean_text(row.get('surname'))}, {' '.join(given.split())}"
+    return Person(kind, str(row[TABLES[kind]["id_column"]]), name,
+                  fold(row.get("surname")), fold(row.get("first_name")), fold(row.get("mi"))[:1],
+                  frozenset(fold(row.get("address")).split()), fold(row.get("emergency_name")),
+                  normalize_contact(str(row.get("emergency_contact") or "")))
+
+# --- Blocking keys ---
+_CODES = {**dict.fromkeys("AEIOUY", "0"), **dict.fromkeys("BFPV", "1"), **dict.fromkeys("CGJKQSXZ", "2"),
+          **dict.fromkeys("DT", "3"), "L": "4", **dict.fromkeys("MN", "5"), "R": "6"}
+
+def phonetic(text):
+    """Soundex-style code of the letters in text, spaces ignored.
+
+    Unlike Soundex the first letter is coded too, so C/K and J/G spellings
+    of a name ("Carlo"/"Karlo") share a code.
+    """
+    letters = [c for c in text if "A" <= c <= "Z"]
+    if not letters:
+        return ""
+    code = last = _CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _CODES.get(c, "")
+        if digit and digit != "0" and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "HW":
+            last = digit
+    return code.ljust(4, "0")
+
+def blocking_keys(p):
+    first = p.first_name.split(" ", 1)[0]
+    if p.surname and first:
+        yield "name:" + "|".join(sorted((phonetic(p.surname), phonetic(first))))
+    if len(p.contact) >= 7:
+        yield "contact:" + p.contact
+
+def build_blocks(people):
+    """Lists of indexes into people that share a key; singletons dropped."""
+    blocks = defaultdict(list)
+    for index, p in enumerate(people):
+        for key in blocking_keys(p):
+            blocks[key].append(index)
+    return [members for members in blocks.values() if len(members) > 1]
+
+def block_pairs(members, people):
+    """Index pairs to compare inside one block."""
+    if len(members) <= MAX_BLOCK:
+        for n, a in enumerate(members):
+            for b in members[n + 1:]:
+                yield a, b
+        return
+    # Sorted neighbourhood: spellings that sort close together get compared
+    members = sorted(members, key=lambda i: (people[i].surname.replace(" ", ""), people[i].first_name))
+    for n, a in enumerate(members):
+        for b in members[n + 1:n + 1 + WINDOW]:
+            yield a, b
+
+# --- Scoring ---
+# Blocks hold the same common names over and over
+@lru_cache(maxsize=1 << 16)
+def jaro_winkler(a, b):
+    if a == b:
+        return 1.0 if a else 0.0
+    la, lb = len(a), len(b)
+    if not la or not lb:
+        return 0.0
+    window = max(max(la, lb) // 2 - 1, 0)
+    taken = [False] * lb
+    a_matches = []
+    for i, c in enumerate(a):
+        for j in range(max(0, i - window), min(lb, i + window + 1)):
+            if not taken[j] and b[j] == c:
+                taken[j] = True
+                a_matches.append(c)
+                break
+    m = len(a_matches)
+    if not m:
+        return 0.0
+    b_matches = [c for c, hit in zip(b, taken) if hit]
+    transpositions = sum(x != y for x, y in zip(a_matches, b_matches)) / 2
+    jaro = (m / la + m / lb + (m - transpositions) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+def _cheap_parts(p, q):
+    """mi, address and contact scores: set and string equality only."""
+    if not p.mi or not q.mi:
+        mi = 0.5
+    else:
+        mi = 1.0 if p.mi == q.mi else 0.0
+    if not p.address or not q.address:
+        address = 0.5  # nothing to go on either way
+    else:
+        address = len(p.address & q.address) / len(p.address | q.address)
+    if not p.contact or not q.contact:
+        contact = 0.5
+    elif p.contact == q.contact:
+        contact = 1.0
+    else:
+        # Same subscriber number behind a different prefix or a typo in front
+        contact = 0.5 if p.contact[-7:] == q.contact[-7:] else 0.0
+    return {"mi": mi, "address": address, "contact": contact}
+
+# Most that the string comparisons can add to the cheap parts
+_NAME_WEIGHT = WEIGHTS["surname"] + WEIGHTS["first_name"] + WEIGHTS["emergency_name"]
+
+def score_pair(p, q, threshold=0.0):
+    """(total, {part: score}) for two people, every part between 0 and 1; None below threshold.
+
+    The cheap parts are scored first; a pair that could not reach threshold
+    even with identical names is dropped before any string comparison.
+    """
+    parts = _cheap_parts(p, q)
+    cheap = sum(WEIGHTS[name] * value for name, value in parts.items())
+    if cheap + _NAME_WEIGHT < threshold:
+        return None
+    surname, first_name = (jaro_winkler(p.surname.replace(" ", ""), q.surname.replace(" ", "")),
+                           jaro_winkler(p.first_name, q.first_name))
+    if surname + first_name < 1.8:
+        # Surname and first name typed into each other's box
+        swapped = (jaro_winkler(p.surname.replace(" ", ""), q.first_name.replace(" ", "")),
+                   jaro_winkler(p.first_name, q.surname))
+        surname, first_name = max((surname, first_name), swapped, key=sum)
+    parts.update(surname=surname, first_name=first_name,
+                 emergency_name=jaro_winkler(p.emergency_name, q.emergency_name))
+    total = sum(WEIGHTS[name] * value for name, value in parts.items())
+    return (total, parts) if total >= threshold else None
+
+def score_blocks(people, blocks, threshold=THRESHOLD):
+    """[(score, a, b, parts)] for the pairs of the blocks at or above threshold."""
+    found = []
+    for members in blocks:
+        for a, b in block_pairs(members, people):
+            scored = score_pair(people[a], people[b], threshold)
+            if scored:
+                found.append((scored[0], a, b, scored[1]))
+    return found
+
+# --- Parallel scoring ---
+_people = None
+
+def _init_worker(people):
+    global _people
+    _people = people
+
+def _score_task(args):
+    blocks, threshold = args
+    return score_blocks(_people, blocks, threshold)
+
+def _comparisons(members):
+    n = len(members)
+    return n * (n - 1) // 2 if n <= MAX_BLOCK else n * WINDOW
+
+def _block_chunks(blocks):
+    """Groups of blocks worth about CHUNK_PAIRS comparisons each."""
+    chunk, size = [], 0
+    for members in blocks:
+        chunk.append(members)
+        size += _comparisons(members)
+        if size >= CHUNK_PAIRS:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+def find_duplicates(people, threshold=THRESHOLD, workers=0):
+    """Ranked [(score, a, b, parts)] over a list of Person; workers > 0 scores in processes.
+
+    A pair met in more than one block is kept once.
+    """
+    blocks = build_blocks(people)
+    if workers:
+        # The people list goes to each worker once; tasks are only lists of indexes
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers, initializer=_init_worker, initargs=(people,)) as pool:
+            results = pool.imap_unordered(_score_task, ((chunk, threshold) for chunk in _block_chunks(blocks)))
+            found = [match for matches in results for match in matches]
+    else:
+        found = score_blocks(people, blocks, threshold)
+    best = {}
+    for match in found:
+        best.setdefault((min(match[1], match[2]), max(match[1], match[2])), match)
+    return sorted(best.values(), key=lambda match: -match[0])
+
+# --- Loading and reporting ---
+def load_people(conn):
+    """Every student and employee as a Person, streamed off the export cursor."""
+    from exporter import build_query, stream_rows, export_columns
+    people = []
+    for kind in TABLES:
+        columns = export_columns(kind)
+        sql, params = build_query(kind)
+        for row in stream_rows(conn, sql, params):
+            people.append(person(kind, dict(zip(columns, row))))
+    return people
+
+REPORT_HEADER = ["rank", "score", "kind_a", "id_a", "name_a", "kind_b", "id_b", "name_b",
+                 "surname", "first_name", "mi", "address", "contact", "emergency_name"]
+
+def report_rows(people, matches):
+    for rank, (total, a, b, parts) in enumerate(matches, 1):
+        p, q = people[a], people[b]
+        yield ([rank, round(total, 3),
+                p.kind, p.record_id, p.name, q.kind, q.record_id, q.name]
+               + [round(parts[name], 2) for name in REPORT_HEADER[8:]])
+
+def write_report(path, people, matches):
+    from exporter import write_rows
+    return write_rows(path, REPORT_HEADER, report_rows(people, matches), sheet_title="Possible duplicates")
+
+def run(conn, path, threshold=THRESHOLD, workers=0):
+    """Load, match and write the report; returns (people, pairs reported, seconds)."""
+    start = time.perf_counter()
+    people = load_people(conn)
+    matches = find_duplicates(people, threshold, workers)
+    write_report(path, people, matches)
+    return len(people), len(matches), time.perf_counter() - start
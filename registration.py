@@ -0,0 +1,146 @@
+"""Table layout and insert path shared by the forms and the batch paths. Keep Qt out of this module."""
+import re
+import unicodedata
+import pymysql
+from schema import KINDS
+from enrollment_stats import bump_counts
+
+# Plain-dict view of the schema for the SQL builders
+TABLES = {
+    name: {"table": kind.table, "id_column": kind.id_column,
+           "columns": kind.columns, "date_column": kind.date_column}
+    for name, kind in KINDS.items()
+}
+
+ER_DUP_ENTRY = 1062
+_DUP_VALUE = re.compile(r"Duplicate entry '(.*)' for key")
+
+class DuplicateRecordError(Exception):
+    """An insert hit one of the UNIQUE constraints; record_id is the clashing value if known."""
+    def __init__(self, kind, record_id=None):
+        if record_id:
+            super().__init__(f"{kind} ID {record_id} already exists")
+        else:
+            super().__init__(f"{kind} ID already exists")
+        self.kind = kind
+        self.record_id = record_id
+
+# Errors that belong to particular rows rather than to the connection or the server:
+# a batch that hits one is retried row by row so only the offending rows are refused
+ROW_ERRORS = (DuplicateRecordError, pymysql.err.IntegrityError, pymysql.err.DataError)
+
+def refusal_message(error):
+    """Why a row in ROW_ERRORS was refused, for reports and the offline journal."""
+    if isinstance(error, DuplicateRecordError):
+        return str(error)
+    return f"Refused by the database: {error.args[-1]}"
+
+def insert_sql(kind):
+    """INSERT statement for one row of the given kind; values follow TABLES[kind]["columns"]."""
+    spec = TABLES[kind]
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        spec["table"], ", ".join(spec["columns"]), ", ".join(["%s"] * len(spec["columns"])))
+
+def insert_records(conn, kind, records):
+    """Insert one or more rows in a single multi-row statement, count them, and commit.
+
+    The UNIQUE constraints do the duplicate check, so there is no SELECT
+    beforehand. A duplicate key rolls the whole statement back and raises
+    DuplicateRecordError; any other error is re-raised after a rollback.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(insert_sql(kind), records)
+        # Same transaction: the counts can never disagree with the rows
+        bump_counts(cursor, kind, records)
+        conn.commit()
+    except pymysql.err.IntegrityError as e:
+        conn.rollback()
+        if e.args and e.args[0] == ER_DUP_ENTRY:
+            match = _DUP_VALUE.search(str(e.args[-1]))
+            raise DuplicateRecordError(kind, match.group(1) if match else None) from e
+        raise
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def existing_ids(conn, kind, ids):
+    """The subset of ids already in the table, in one IN lookup."""
+    ids = list(ids)
+    if not ids:
+        return set()
+    spec = TABLES[kind]
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT {0} FROM {1} WHERE {0} IN ({2})".format(
+            spec["id_column"], spec["table"], ", ".join(["%s"] * len(ids))), ids)
+        return {row[spec["id_column"]] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+# --- Field rules, the same ones the forms apply while the user types ---
+REQUIRED_FIELDS = {
+    name: tuple((field.name, field.label) for field in kind.required) for name, kind in KINDS.items()
+}
+
+# UTF-8 Ñ/ñ decoded as cp1252, as older spreadsheet exports often arrive
+ENYE_REPAIRS = (("Ã‘", "Ñ"), ("Ã±", "ñ"))
+
+def clean_text(value):
+    """Collapse whitespace, compose N + combining tilde into Ñ/ñ and undo the mojibake above."""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFC", " ".join(str(value).split()))
+    for bad, good in ENYE_REPAIRS:
+        text = text.replace(bad, good)
+    return text
+
+def capitalize_words(text):
+    """First letter of every word upper-case; spacing is left as typed."""
+    return " ".join(word.capitalize() for word in text.split(" "))
+
+def normalize_mi(text):
+    text = text.strip()
+    return text[0].upper() + "." if text else ""
+
+def normalize_contact(text):
+    digits = "".join(ch for ch in text if ch.isdigit())
+    # Spreadsheets keep mobile numbers as integers and drop the leading zero
+    if len(digits) == 10 and digits.startswith("9"):
+        digits = "0" + digits
+    return digits
+
+# Field.case in the schema -> normalizer
+CASE_RULES = {
+    "upper": str.upper,
+    "words": capitalize_words,
+    "initial": normalize_mi,
+    "digits": normalize_contact,
+}
+
+def normalize_fields(kind, fields):
+    """Apply the form rules to a dict of raw field values; returns a new dict of strings."""
+    record = {key: clean_text(value) for key, value in fields.items()}
+    for field in KINDS[kind].fields:
+        rule = CASE_RULES.get(field.case)
+        if rule:
+            record[field.name] = rule(record.get(field.name, ""))
+    return record
+
+def validate_fields(kind, record):
+    """Error messages for a normalized record; an empty list means it can be inserted."""
+    errors = []
+    missing = [label for key, label in REQUIRED_FIELDS[kind] if not record.get(key)]
+    if missing:
+        errors.append("Please complete all required fields: " + ", ".join(missing))
+    for field in KINDS[kind].fields:
+        value = record.get(field.name, "")
+        if field.case == "digits" and field.max_length and value and len(value) != field.max_length:
+            errors.append(f"{field.label} must be exactly {field.max_length} digits.")
+    return errors
+
+def record_values(kind, record):
+    """Compact record (a namedtuple in TABLES[kind]["columns"] order) from a dict of field values."""
+    return KINDS[kind].record(record)
@@ -0,0 +1,259 @@
+"""Browse registered students or employees in a table that loads as it scrolls.
+
+Pages come from search.search_page (keyset, never OFFSET) on the thread
+pool, a block of rows at a time. Only the most recently used blocks are
+kept; a block that was dropped is fetched again from its saved cursor when
+it scrolls back into view, so memory stays bounded however far one scrolls:
+
+    python registrations_view.py student
+"""
+import sys
+from collections import OrderedDict
+from functools import partial
+from PyQt5.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QTableView, QHeaderView
+)
+from PyQt5.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+)
+from db_connector import pooled_connection
+from exporter import export_columns
+from search import search_page
+
+def fetch_from_database(kind, filters, after, limit):
+    """Default page source: (row tuples, cursor for the next page or None)."""
+    columns = export_columns(kind)
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        rows, next_after = search_page(conn, kind, after=after, limit=limit, **filters)
+    # Tuples instead of the cursor's dicts: a fraction of the memory per row
+    return [tuple(row[column] for column in columns) for row in rows], next_after
+
+class PageSignals(QObject):
+    # generation, block, rows, next cursor
+    loaded = pyqtSignal(int, int, object, object)
+    # generation, block, error message
+    failed = pyqtSignal(int, int, str)
+
+class PageWorker(QRunnable):
+    """Fetches one block of rows on the global thread pool."""
+    def __init__(self, fetch_page, generation, block, after, limit):
+        super().__init__()
+        self.fetch_page = fetch_page
+        self.generation = generation
+        self.block = block
+        self.after = after
+        self.limit = limit
+        self.signals = PageSignals()
+
+    def run(self):
+        try:
+            rows, next_after = self.fetch_page(self.after, self.limit)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, self.block, str(e))
+            return
+        self.signals.loaded.emit(self.generation, self.block, rows, next_after)
+
+class RegistrationTableModel(QAbstractTableModel):
+    """Lazy model over one registration table.
+
+    Block k holds rows [k * block_size, (k + 1) * block_size). Blocks are
+    appended through canFetchMore/fetchMore as the view nears the end; at
+    most max_blocks of them stay in memory, least recently shown dropped
+    first. The cursor before every block is kept (one small tuple per
+    block) so a dropped block can be fetched again.
+    """
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, kind, block_size=500, max_blocks=40, fetch_page=None, parent=None, **filters):
+        super().__init__(parent)
+        self.kind = kind
+        self.columns = export_columns(kind)
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._source = fetch_page
+        self._generation = 0
+        self._workers = {}  # (generation, block) -> PageSignals still running
+        self.set_filters(**filters)
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section].replace("_", " ").title()
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        block, offset = divmod(index.row(), self.block_size)
+        rows = self._blocks.get(block)
+        if rows is None:
+            # Scrolled back to a dropped block: show blanks until it is fetched again
+            self._request(block)
+            return None
+        self._blocks.move_to_end(block)
+        value = rows[offset][index.column()]
+        return "" if value is None else str(value)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and self._frontier not in self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._request(self._frontier)
+
+    # --- Loading ---
+    def set_filters(self, **filters):
+        """Start over with new search filters (see search.build_search); pending pages are ignored."""
+        self.beginResetModel()
+        self._generation += 1
+        self._fetch_page = self._source or partial(fetch_from_database, self.kind, filters)
+        self._row_count = 0
+        self._block_starts = [None]  # cursor before block k; the last entry is the next new block
+        self._blocks = OrderedDict()  # block -> list of row tuples, least recently used first
+        self._loading = set()
+        self._failed = set()
+        self._exhausted = False
+        self.endResetModel()
+
+    @property
+    def _frontier(self):
+        """Index of the next block that has never been loaded."""
+        return len(self._block_starts) - 1
+
+    @property
+    def blocks_in_memory(self):
+        return len(self._blocks)
+
+    def _request(self, block):
+        if block in self._loading or block in self._failed:
+            return
+        worker = PageWorker(self._fetch_page, self._generation, block,
+                            self._block_starts[block], self.block_size)
+        worker.signals.loaded.connect(self.on_block_loaded)
+        worker.signals.failed.connect(self.on_block_failed)
+        self._loading.add(block)
+        self._workers[self._generation, block] = worker.signals
+        QThreadPool.globalInstance().start(worker)
+
+    def on_block_loaded(self, generation, block, rows, next_after):
+        self._workers.pop((generation, block), None)
+        if generation != self._generation:
+            return
+        self._loading.discard(block)
+        self._blocks[block] = rows
+        self._blocks.move_to_end(block)
+        # Only a block starting at the current end adds rows; the last block fetched
+        # again after it was dropped is still the frontier but its rows are already counted
+        if block * self.block_size == self._row_count:
+            if rows:
+                first = self._row_count
+                self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+                self._row_count += len(rows)
+                self.endInsertRows()
+            if next_after is None or len(rows) < self.block_size:
+                self._exhausted = True
+            else:
+                self._block_starts.append(next_after)
+        elif rows:
+            first = block * self.block_size
+            self.dataChanged.emit(self.index(first, 0),
+                                  self.index(first + len(rows) - 1, len(self.columns) - 1))
+        self._evict()
+
+    def on_block_failed(self, generation, block, message):
+        self._workers.pop((generation, block), None)
+        if generation != self._generation:
+            return
+        self._loading.discard(block)
+        # Not retried on every repaint; set_filters() starts over
+        self._failed.add(block)
+        print(f"Loading {self.kind} rows failed: {message}")
+        self.load_failed.emit(message)
+
+    def _evict(self):
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+
+class RegistrationBrowser(QWidget):
+    """Kind selector, surname search box and the lazily loaded table."""
+    def __init__(self, kind="student"):
+        super().__init__()
+        self.setWindowTitle("Registrations")
+        self.resize(1100, 700)
+
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItems(["student", "employee"])
+        self.kind_combo.setCurrentText(kind)
+        self.kind_combo.currentTextChanged.connect(self.on_kind_changed)
+
+        self.surname_edit = QLineEdit()
+        self.surname_edit.setPlaceholderText("Surname starts with...")
+        # Search once typing pauses, not on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(300)
+        self._search_timer.timeout.connect(self.apply_search)
+        self.surname_edit.textChanged.connect(self._search_timer.start)
+
+        self.status_label = QLabel()
+
+        self.table = QTableView()
+        self.table.setAlternatingRowColors(True)
+        # Fixed row heights: the view never measures rows it has not shown
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.kind_combo)
+        top_layout.addWidget(self.surname_edit, 1)
+        top_layout.addWidget(self.status_label)
+        layout = QVBoxLayout(self)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.table)
+
+        self.set_model(kind)
+
+    def set_model(self, kind):
+        self.model = RegistrationTableModel(kind, parent=self)
+        self.model.rowsInserted.connect(self.update_status)
+        self.model.modelReset.connect(self.update_status)
+        self.model.load_failed.connect(self.status_label.setText)
+        old_model = self.table.model()
+        self.table.setModel(self.model)
+        if old_model is not None:
+            old_model.deleteLater()
+        self.apply_search()
+
+    def on_kind_changed(self, kind):
+        self.set_model(kind)
+
+    def apply_search(self):
+        surname = self.surname_edit.text().strip()
+        filters = {"surname": surname} if surname else {}
+        self.model.set_filters(**filters)
+        self.model.fetchMore()
+
+    def update_status(self, *args):
+        more = "+" if self.model.canFetchMore() else ""
+        self.status_label.setText(f"{self.model.rowCount()}{more} rows")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    app = QApplication(sys.argv)
+    browser = RegistrationBrowser(argv[0] if argv else "student")
+    browser.show()
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Declarative field schema for student and employee registrations.
+
+One field list per kind produces the INSERT column list, the compact record
+type used by the batch paths, the required-field check and the form widgets,
+so the GUI and the batch code cannot drift apart. dbsetup.txt is the
+authority for table and column names. Keep Qt out of this module.
+"""
+from collections import namedtuple
+
+# Form sections, in the order the forms lay them out
+NAME, ADDRESS, DETAILS, EMERGENCY = "name", "address", "details", "emergency"
+SECTIONS = (NAME, ADDRESS, DETAILS, EMERGENCY)
+
+# Address parts are typed separately but stored together in the address column
+ADDRESS_COLUMN = "address"
+
+class Field:
+    """One input on the form.
+
+    label is used in error messages, caption on the form itself. case names
+    the normalizer applied to the value (see registration.CASE_RULES).
+    """
+    __slots__ = ("name", "label", "caption", "section", "required", "case", "choices", "max_length")
+
+    def __init__(self, name, label, section, caption=None, required=False, case=None,
+                 choices=(), max_length=None):
+        self.name = name
+        self.label = label
+        self.caption = caption or label
+        self.section = section
+        self.required = required
+        self.case = case
+        self.choices = tuple(choices)
+        self.max_length = max_length
+
+    @property
+    def widget(self):
+        return "combo" if self.choices else "line"
+
+    def __repr__(self):
+        return f"Field({self.name!r})"
+
+class Kind:
+    """Everything derived from one kind's field list."""
+    __slots__ = ("name", "label", "table", "id_column", "date_column", "fields",
+                 "columns", "required", "Record", "_sources")
+
+    def __init__(self, name, label, table, date_column, fields):
+        self.name = name
+        self.label = label
+        self.table = table
+        self.id_column = fields[0].name
+        self.date_column = date_column
+        self.fields = tuple(fields)
+        # Column order follows the field list; the address parts collapse into one column
+        columns = []
+        for field in self.fields:
+            column = ADDRESS_COLUMN if field.section == ADDRESS else field.name
+            if column not in columns:
+                columns.append(column)
+        self.columns = tuple(columns)
+        self._sources = tuple(
+            tuple(f.name for f in self.fields if f.section == ADDRESS) if column == ADDRESS_COLUMN
+            else column for column in self.columns)
+        self.required = tuple(f for f in self.form_fields() if f.required)
+        # namedtuple instances carry no per-row __dict__; they go to executemany as they are
+        self.Record = namedtuple(label + "Record", self.columns)
+
+    def form_fields(self, section=None):
+        """Fields in the order the form shows them, optionally only one section."""
+        sections = (section,) if section else SECTIONS
+        return [f for s in sections for f in self.fields if f.section == s]
+
+    def record(self, values):
+        """Record from a field-name -> value mapping; missing fields are empty strings."""
+        get = values.get
+        row = []
+        for source in self._sources:
+            if isinstance(source, tuple):
+                # An address already joined (e.g. a spreadsheet column) wins over the parts
+                row.append(get(ADDRESS_COLUMN) or ", ".join(get(part, "") for part in source))
+            else:
+                row.append(get(source, ""))
+        return self.Record._make(row)
+
+def _name_fields():
+    return [
+        Field("surname", "Surname", NAME, required=True, case="upper"),
+        Field("first_name", "First Name", NAME, required=True, case="words"),
+        Field("mi", "Middle Initial", NAME, caption="MI.", required=True, case="initial"),
+        Field("extension", "Extension", NAME, caption="Ext."),
+    ]
+
+def _address_fields(required):
+    return [
+        Field("barangay", "Barangay", ADDRESS, required=required),
+        Field("town", "Town/Municipality", ADDRESS, required=required),
+        Field("province", "Province", ADDRESS, required=required),
+    ]
+
+def _emergency_fields(person):
+    return [
+        Field("emergency_name", "Emergency Contact Name", EMERGENCY, caption="Name", required=True),
+        Field("emergency_relation", "Emergency Relation", EMERGENCY,
+              caption=f"Relation to {person}", required=True),
+        Field("emergency_contact", "Emergency Contact Number", EMERGENCY, caption="Contact Number",
+              required=True, case="digits", max_length=11),
+    ]
+
+YEARS = ("1st Year", "2nd Year", "3rd Year", "4th Year")
+
+COURSES = (
+    "Bachelor of Science in Accountancy",
+    "Bachelor of Science in Accounting Information System",
+    "Bachelor of Science in Civil Engineering",
+    "Bachelor of Science in Computer Engineering",
+    "Bachelor of Science in Criminology",
+    "Bachelor of Science in Hospitality Management",
+    "Bachelor of Science in Tourism Management",
+    "Bachelor of Science in Information Technology",
+    "Bachelor of Science in Computer Science",
+    "Bachelor of Science in Psychology",
+    "Bachelor of Science in Business Administration - Major in Financial Management",
+    "Bachelor of Science in Business Administration - Major in Marketing Management",
+    "Bachelor of Science in Business Administration - Major in Human Resources Management",
+    "Bachelor of Science in Business Administration - Major in Operations Management",
+    "Bachelor of Elementary Education",
+    "Bachelor of Secondary Education - Major in English",
+    "Bachelor of Secondary Education - Major in Mathematics",
+    "Bachelor of Secondary Education - Major in Science",
+    "Bachelor of Secondary Education - Major in Filipino",
+    "Associate in Computer Technology",
+)
+
+# The ID field comes first: offline journal rows and values[0] rely on that order
+KINDS = {
+    "student": Kind("student", "Student", "students", "registration_date", [
+        Field("student_id", "Student ID", DETAILS, required=True),
+        *_name_fields(),
+        *_address_fields(required=False),
+        Field("year", "Year", DETAILS, choices=YEARS),
+        Field("course", "Course", DETAILS, choices=COURSES),
+        *_emergency_fields("Student"),
+    ]),
+    "employee": Kind("employee", "Employee", "employee", "datetime", [
+        Field("employee_id", "Employee ID", DETAILS, required=True),
+        *_name_fields(),
+        *_address_fields(required=True),
+        Field("department", "Department", DETAILS, required=True),
+        Field("position", "Position", DETAILS, required=True),
+        *_emergency_fields("Employee"),
+    ]),
+}
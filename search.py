@@ -0,0 +1,139 @@
+"""Indexed lookups for the admin side, paged by keyset instead of OFFSET.
+
+    rows, after = search("student", surname="DELA")
+    rows, after = search("student", surname="DELA", after=after)   # next page
+
+Name searches are ordered by (surname, first_name, id) and walk the
+(surname, first_name) index; filter-only searches are ordered by id. The
+cursor is the order key of the last row returned, so a deep page costs the
+same as the first one. Run ensure_indexes() (python -m iiscli migrate)
+once per database.
+"""
+from db_connector import pooled_connection
+from registration import TABLES
+from exporter import export_columns
+
+PAGE_SIZE = 50
+
+# InnoDB appends the primary key to every secondary index, so (surname, first_name)
+# is really (surname, first_name, id): exactly the keyset order of a name search.
+SEARCH_INDEXES = {
+    "student": {
+        "idx_students_name": ("surname", "first_name"),
+        "idx_students_course_year": ("course", "year"),
+    },
+    "employee": {
+        "idx_employee_name": ("surname", "first_name"),
+        "idx_employee_department": ("department", "position"),
+    },
+}
+
+# Exact-match filters per kind, in index column order
+FILTERS = {"student": ("course", "year"), "employee": ("department", "position")}
+
+NAME_ORDER = ("surname", "first_name", "id")
+ID_ORDER = ("id",)
+
+def _prefix(value):
+    """LIKE pattern matching values that start with value."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+def _after(order, after):
+    """Rows strictly after the cursor in order, spelled out so MySQL range-scans the index."""
+    # (a, b, c) > (x, y, z)  ->  a > x OR (a = x AND (b > y OR (b = y AND c > z)))
+    clause, params = None, []
+    for column, value in reversed(tuple(zip(order, after))):
+        if clause is None:
+            clause, params = f"{column} > %s", [value]
+        else:
+            clause, params = f"{column} > %s OR ({column} = %s AND ({clause}))", [value, value] + params
+    if len(order) == 1:
+        return clause, params
+    # The leading bound on its own gives the optimizer a range to start from
+    return f"{order[0]} >= %s AND ({clause})", [after[0]] + params
+
+def build_search(kind, surname=None, first_name=None, after=None, limit=PAGE_SIZE,
+                 table=None, **filters):
+    """(sql, params, order) for one page; surname/first_name match as prefixes, filters exactly."""
+    unknown = set(filters) - set(FILTERS[kind])
+    if unknown:
+        raise ValueError(f"Unknown {kind} filter(s): {', '.join(sorted(unknown))}")
+    where, params = [], []
+    if surname:
+        where.append("surname LIKE %s")
+        params.append(_prefix(surname))
+    if first_name:
+        where.append("first_name LIKE %s")
+        params.append(_prefix(first_name))
+    for column in FILTERS[kind]:
+        if filters.get(column):
+            where.append(f"{column} = %s")
+            params.append(filters[column])
+    order = NAME_ORDER if surname else ID_ORDER
+    if after:
+        clause, after_params = _after(order, after)
+        where.append(clause)
+        params += after_params
+    sql = "SELECT {} FROM {}".format(", ".join(export_columns(kind)), table or TABLES[kind]["table"])
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY {} LIMIT %s".format(", ".join(order))
+    params.append(limit)
+    return sql, params, order
+
+def search_page(conn, kind, surname=None, first_name=None, after=None, limit=PAGE_SIZE,
+                table=None, **filters):
+    """One page of dict rows and the cursor for the next page (None on the last page)."""
+    sql, params, order = build_search(kind, surname, first_name, after, limit + 1, table, **filters)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    # One extra row tells whether there is another page without a COUNT(*)
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, tuple(rows[-1][column] for column in order)
+
+def search(kind, surname=None, first_name=None, after=None, limit=PAGE_SIZE, **filters):
+    with pooled_connection(user_role="admin") as conn:
+        if conn is None:
+            raise ConnectionError("Failed to connect to the database.")
+        return search_page(conn, kind, surname, first_name, after, limit, **filters)
+
+def explain(conn, sql, params):
+    """EXPLAIN rows (dicts) for a query."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("EXPLAIN " + sql, params)
+        return list(cursor.fetchall())
+    finally:
+        cursor.close()
+
+# --- Migration ---
+def existing_indexes(conn, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT DISTINCT INDEX_NAME AS name FROM information_schema.STATISTICS "
+                       "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+        return {row["name"] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+def ensure_indexes(conn, kind, table=None):
+    """Add whichever search indexes the table is missing; returns the names added."""
+    table = table or TABLES[kind]["table"]
+    present = existing_indexes(conn, table)
+    added = []
+    cursor = conn.cursor()
+    try:
+        for name, columns in SEARCH_INDEXES[kind].items():
+            if name not in present:
+                cursor.execute("ALTER TABLE {} ADD INDEX {} ({})".format(table, name, ", ".join(columns)))
+                added.append(name)
+    finally:
+        cursor.close()
+    return added
@@ -0,0 +1,71 @@
+"""Time-to-first-paint of the landing page, broken down by import.
+
+    python startup_timing.py [--top 15]
+
+Starts the app in a child interpreter with -X importtime, stops it as soon
+as the landing page has painted once, and reports the wall time to that
+paint together with the slowest top-level imports that happened before it.
+"""
+import os, sys, time, argparse, subprocess
+
+HEAVY_MODULES = ("iisforms", "pymysql", "pandas", "openpyxl", "db_connector")
+
+def child():
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    import first_page
+    app = QApplication(sys.argv)
+    window = first_page.MainWindow(warm_up=False)
+
+    def painted():
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"FIRST_PAINT {time.time():.6f} {','.join(loaded) or '-'}", flush=True)
+        app.quit()
+    window.landing.first_painted.connect(painted)
+    QTimer.singleShot(30000, app.quit)
+    window.show()
+    app.exec_()
+
+def parse_importtime(stderr):
+    """(cumulative_us, module) for every top-level import in -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not name.startswith(" ") or name.startswith("  "):
+            continue  # nested import, already counted in its parent's cumulative time
+        imports.append((int(cumulative_us), name.strip()))
+    return imports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report time-to-first-paint by import.")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child()
+        return 0
+
+    start = time.time()
+    result = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"],
+                            capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    painted = [line for line in result.stdout.splitlines() if line.startswith("FIRST_PAINT")]
+    if not painted:
+        print("The landing page never painted.", file=sys.stderr)
+        print(result.stderr[-2000:], file=sys.stderr)
+        return 1
+    _, paint_time, loaded = painted[0].split(" ", 2)
+    imports = parse_importtime(result.stderr)
+    total_import_ms = sum(us for us, _ in imports) / 1000
+
+    print(f"time to first paint: {(float(paint_time) - start) * 1000:.0f} ms "
+          f"(process start included), imports: {total_import_ms:.0f} ms")
+    print(f"heavy modules loaded before first paint: {loaded}")
+    for us, name in sorted(imports, reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
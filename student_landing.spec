@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['pymysql', 'PyQt5', 'pandas', 'openpyxl'],
+    hiddenimports=['pymysql', 'PyQt5'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
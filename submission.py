@@ -0,0 +1,70 @@
+"""Saving one registration from any front end: straight to MySQL, or into the offline journal.
+
+With IIS_INGEST_ADDR=host:port set, records go to the ingestion daemon
+(ingest_server.py) instead, which batches them with other kiosks' records.
+Shared by the forms and the batch tools, so keep Qt out of this module.
+"""
+import os, json, socket
+from db_connector import pooled_connection
+from registration import insert_records, DuplicateRecordError
+import offline_queue
+
+SAVED = "saved"
+QUEUED = "queued"
+DUPLICATE = "duplicate"
+ALREADY_QUEUED = "already_queued"
+
+INGEST_ADDR = os.environ.get("IIS_INGEST_ADDR", "")
+INGEST_TIMEOUT = 30
+
+def _ingest_address():
+    host, _, port = INGEST_ADDR.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def send_to_daemon(kind, values, address=None, timeout=INGEST_TIMEOUT):
+    """Hand one row to the ingestion daemon; returns its status ("saved", "duplicate", ...).
+
+    Raises ConnectionError if the daemon cannot be reached before the row
+    was sent, and OSError if the answer does not come back after it was.
+    """
+    try:
+        sock = socket.create_connection(address or _ingest_address(), timeout=timeout)
+    except OSError as e:
+        raise ConnectionError(f"Ingestion service unreachable: {e}") from e
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            stream.write(json.dumps({"id": 1, "kind": kind, "values": list(values)}).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+        except ConnectionError as e:
+            # The row may already be in; it must not be queued for a second upload
+            raise OSError(f"Lost the ingestion service mid-request: {e}") from e
+    if not line:
+        raise OSError("The ingestion service closed the connection without an answer.")
+    reply = json.loads(line)
+    if reply["status"] == "error":
+        raise RuntimeError(reply.get("message") or "The ingestion service rejected the record.")
+    return reply["status"]
+
+def save_record(kind, values):
+    """Store one row; returns SAVED, QUEUED, DUPLICATE or ALREADY_QUEUED. Other errors propagate."""
+    queue = offline_queue.get_queue()
+    # Queue behind anything still waiting so rows reach the server in order
+    if queue.has_pending(kind):
+        return QUEUED if queue.enqueue(kind, values) else ALREADY_QUEUED
+    if INGEST_ADDR:
+        try:
+            status = send_to_daemon(kind, values)
+        except ConnectionError:
+            status = "unavailable"
+        if status == "unavailable":
+            return QUEUED if queue.enqueue(kind, values) else ALREADY_QUEUED
+        return DUPLICATE if status == "duplicate" else SAVED
+    with pooled_connection(user_role=kind) as conn:
+        if conn is None:
+            return QUEUED if queue.enqueue(kind, values) else ALREADY_QUEUED
+        try:
+            insert_records(conn, kind, [values])
+        except DuplicateRecordError:
+            return DUPLICATE
+    return SAVED